@@ -4,18 +4,32 @@ YunMin-EfficientData Deduplication Module
 This module provides SlimPajama-based deduplication functionality using MinHash and LSH.
 """
 
-from .minhash_utils import tokenize_ngrams, create_minhash, jaccard_similarity
+import importlib
+
+from .minhash_utils import (
+    tokenize_ngrams,
+    create_minhash,
+    create_minhash_oph,
+    jaccard_similarity,
+)
 from .cluster_reduction import select_representative_document
 
-try:
-    from .distributed_dedup import run_dedup_ray
-except Exception:  # pragma: no cover - optional dependency
-    run_dedup_ray = None
+# Entry points whose modules pull in heavy dependencies (Ray, Redis, pandas);
+# they are imported on first access instead of with the package.
+_LAZY_ATTRS = {
+    "run_deduplication": (".slimpajama_dedup", "main"),
+    "run_dedup_ray": (".distributed_dedup", "run_dedup_ray"),
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attr = _LAZY_ATTRS[name]
+    value = getattr(importlib.import_module(module_name, __name__), attr)
+    globals()[name] = value
+    return value
 
-try:  # Optional heavy dependency
-    from .slimpajama_dedup import main as run_deduplication
-except Exception:  # pragma: no cover - dependency may be missing
-    run_deduplication = None
 
 __version__ = "1.0.0"
 __all__ = [
@@ -23,6 +37,7 @@ __all__ = [
     "run_dedup_ray",
     "tokenize_ngrams",
     "create_minhash",
+    "create_minhash_oph",
     "jaccard_similarity",
     "select_representative_document"
 ]
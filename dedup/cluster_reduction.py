@@ -2,9 +2,65 @@
 Cluster reduction utilities for selecting representative documents
 """
 
-from typing import Dict, List
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 import logging
 
+import numpy as np
+
+
+_SOURCE_SCORES = {
+    'wikipedia': 0.9,
+    'news': 0.8,
+    'book': 0.8,
+    'academic': 0.9,
+    'government': 0.7,
+    'social': 0.3,
+    'web': 0.4,
+    'forum': 0.2
+}
+_METADATA_FIELDS = ('source', 'domain', 'lang', 'tokens')
+_TS_FORMATS = ('%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d')
+
+
+@dataclass
+class _ClusterColumns:
+    """Column-wise view of the documents in a cluster"""
+
+    texts: List[str]
+    lengths: np.ndarray
+    sources: np.ndarray
+    has_tokens: np.ndarray
+    token_lens: np.ndarray
+    metadata_counts: np.ndarray
+
+
+def _materialize_cluster(cluster_docs: List[Dict]) -> _ClusterColumns:
+    """Extract the fields used for scoring into parallel arrays in one pass"""
+    n = len(cluster_docs)
+    texts: List[str] = []
+    sources = np.empty(n, dtype=object)
+    has_tokens = np.zeros(n, dtype=bool)
+    token_lens = np.zeros(n, dtype=np.int64)
+    metadata_counts = np.zeros(n, dtype=np.int64)
+
+    for idx, doc in enumerate(cluster_docs):
+        texts.append(doc.get('text', '') or '')
+        sources[idx] = str(doc.get('source') or '').lower()
+
+        tokens = doc.get('tokens')
+        if isinstance(tokens, list):
+            has_tokens[idx] = True
+            token_lens[idx] = len(tokens)
+
+        metadata_counts[idx] = sum(1 for field in _METADATA_FIELDS if doc.get(field))
+
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=n)
+    return _ClusterColumns(texts, lengths, sources, has_tokens, token_lens, metadata_counts)
+
 
 def select_representative_document(cluster_docs: List[Dict], strategy: str = "longest") -> int:
     """
@@ -36,82 +92,68 @@ def select_representative_document(cluster_docs: List[Dict], strategy: str = "lo
 
 def _select_longest_document(cluster_docs: List[Dict]) -> int:
     """Select document with most tokens/characters"""
-    max_length = 0
-    best_idx = 0
+    return int(np.argmax(document_lengths(cluster_docs)))
 
-    for idx, doc in enumerate(cluster_docs):
-        text = doc.get('text', '')
 
-        # Prefer token count if available, otherwise use character count
-        if 'tokens' in doc and isinstance(doc['tokens'], list):
-            length = len(doc['tokens'])
-        else:
-            length = len(text)
+def document_lengths(docs: List[Dict]) -> np.ndarray:
+    """Return the length used by the "longest" strategy for each document"""
+    # Prefer token count if available, otherwise use character count
+    return np.fromiter((_document_length(doc) for doc in docs), dtype=np.int64, count=len(docs))
 
-        if length > max_length:
-            max_length = length
-            best_idx = idx
 
-    return best_idx
+def _document_length(doc: Dict) -> int:
+    """Return the token count of ``doc`` if available, else its character count"""
+    tokens = doc.get('tokens')
+    if isinstance(tokens, list):
+        return len(tokens)
+    return len(doc.get('text', '') or '')
 
 
 def _select_newest_document(cluster_docs: List[Dict]) -> int:
     """Select document with most recent timestamp"""
-    newest_time = None
-    best_idx = 0
+    indices: List[int] = []
+    epochs: List[float] = []
 
     for idx, doc in enumerate(cluster_docs):
-        timestamp = doc.get('timestamp')
-
-        if timestamp is None:
-            continue
-
-        # Handle different timestamp formats
-        try:
-            if isinstance(timestamp, str):
-                from datetime import datetime
-                # Try common formats
-                for fmt in ['%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d']:
-                    try:
-                        parsed_time = datetime.strptime(timestamp, fmt)
-                        break
-                    except ValueError:
-                        continue
-                else:
-                    continue
-            elif isinstance(timestamp, (int, float)):
-                from datetime import datetime
-                parsed_time = datetime.fromtimestamp(timestamp)
-            else:
-                continue
-
-            if newest_time is None or parsed_time > newest_time:
-                newest_time = parsed_time
-                best_idx = idx
-
-        except Exception:
-            continue
+        epoch = _timestamp_to_epoch(doc.get('timestamp'))
+        if epoch is not None:
+            indices.append(idx)
+            epochs.append(epoch)
 
     # If no valid timestamps found, fall back to longest
-    if newest_time is None:
+    if not epochs:
         return _select_longest_document(cluster_docs)
 
-    return best_idx
+    return indices[int(np.argmax(np.asarray(epochs, dtype=np.float64)))]
 
 
-def _select_highest_quality_document(cluster_docs: List[Dict]) -> int:
-    """Select document with highest quality score"""
-    best_score = -1
-    best_idx = 0
+def _timestamp_to_epoch(timestamp) -> Optional[float]:
+    """Convert a string or numeric timestamp to epoch seconds (None if invalid)"""
+    if isinstance(timestamp, (int, float)):
+        epoch = float(timestamp)
+        return epoch if math.isfinite(epoch) else None
 
-    for idx, doc in enumerate(cluster_docs):
-        score = _calculate_quality_score(doc)
+    if not isinstance(timestamp, str):
+        return None
+
+    # Handle different timestamp formats, ISO 8601 first
+    try:
+        return datetime.fromisoformat(timestamp).timestamp()
+    except (ValueError, OverflowError, OSError):
+        pass
+
+    for fmt in _TS_FORMATS:
+        try:
+            return datetime.strptime(timestamp, fmt).timestamp()
+        except (ValueError, OverflowError, OSError):
+            continue
+    return None
 
-        if score > best_score:
-            best_score = score
-            best_idx = idx
 
-    return best_idx
+def _select_highest_quality_document(cluster_docs: List[Dict]) -> int:
+    """Select document with highest quality score"""
+    scores = _quality_scores(_materialize_cluster(cluster_docs))
+    return int(np.argmax(scores))
 
 
 def _calculate_quality_score(doc: Dict) -> float:
@@ -124,63 +166,95 @@ def _calculate_quality_score(doc: Dict) -> float:
     - Language quality indicators
     - Structural completeness
     """
-    text = doc.get('text', '')
-    score = 0.0
+    return float(_quality_scores(_materialize_cluster([doc]))[0])
+
+
+def _quality_scores(columns: _ClusterColumns) -> np.ndarray:
+    """Compute quality scores for every document of a cluster at once"""
+    lengths = columns.lengths
 
     # Length factor (normalized)
-    text_length = len(text)
-    score += min(text_length / 1000, 1.0) * 0.3
+    scores = np.minimum(lengths / 1000, 1.0) * 0.3
 
     # Source quality (if available)
-    source = doc.get('source', '').lower()
-    source_scores = {
-        'wikipedia': 0.9,
-        'news': 0.8,
-        'book': 0.8,
-        'academic': 0.9,
-        'government': 0.7,
-        'social': 0.3,
-        'web': 0.4,
-        'forum': 0.2
-    }
+    scores += np.fromiter(
+        (_source_score(source) for source in columns.sources),
+        dtype=np.float64,
+        count=len(lengths),
+    )
+
+    # Language quality indicators
+    sentence_scores = np.zeros(len(lengths))
+    korean_ratios = np.zeros(len(lengths))
+    diversity_scores = np.zeros(len(lengths))
+    for idx, text in enumerate(columns.texts):
+        if not text:
+            continue
+        sentence_scores[idx], korean_ratios[idx], diversity_scores[idx] = _text_quality(text)
+
+    scores += sentence_scores
+    scores += korean_ratios * 0.2
+    scores += diversity_scores * 0.1
+
+    # Metadata completeness
+    scores += (columns.metadata_counts / len(_METADATA_FIELDS)) * 0.1
+
+    return scores
 
-    for source_type, source_score in source_scores.items():
+
+@lru_cache(maxsize=4096)
+def _source_score(source: str) -> float:
+    """
+    Return the weighted reliability score for a lower-cased source name
+
+    Source names repeat heavily across a corpus, so results are memoized and
+    the keyword scan runs once per distinct name. Keywords are checked in
+    ``_SOURCE_SCORES`` order, so the first listed match wins.
+    """
+    for source_type, source_score in _SOURCE_SCORES.items():
         if source_type in source:
-            score += source_score * 0.2
-            break
+            return source_score * 0.2
+    return 0.1  # Default source score
+
+
+def _code_points(text: str) -> np.ndarray:
+    """Return the Unicode code points of ``text`` as a ``np.uint32`` array"""
+    return np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+
+
+def _korean_char_count(codes: np.ndarray) -> int:
+    """Count Hangul syllables (U+AC00..U+D7AF) in a code point array"""
+    return int(np.count_nonzero((codes >= 0xAC00) & (codes <= 0xD7AF)))
+
+
+def _text_quality(text: str) -> Tuple[float, float, float]:
+    """Return (sentence score, Korean ratio, word diversity) for ``text``"""
+    text_length = len(text)
+    codes = _code_points(text)
+
+    # Check for proper sentence structure
+    sentence_endings = np.count_nonzero(
+        (codes == ord('.')) | (codes == ord('!')) | (codes == ord('?'))
+    )
+    avg_sentence_length = text_length / max(sentence_endings, 1)
+
+    # Prefer moderate sentence lengths (not too short, not too long)
+    if 20 <= avg_sentence_length <= 100:
+        sentence_score = 0.2
+    elif 10 <= avg_sentence_length <= 150:
+        sentence_score = 0.1
     else:
-        score += 0.1  # Default source score
+        sentence_score = 0.0
 
-    # Language quality indicators
-    if text:
-        # Check for proper sentence structure
-        sentence_endings = text.count('.') + text.count('!') + text.count('?')
-        avg_sentence_length = text_length / max(sentence_endings, 1)
-
-        # Prefer moderate sentence lengths (not too short, not too long)
-        if 20 <= avg_sentence_length <= 100:
-            score += 0.2
-        elif 10 <= avg_sentence_length <= 150:
-            score += 0.1
-
-        # Check for Korean content (basic heuristic)
-        korean_chars = sum(1 for c in text if '\uac00' <= c <= '\ud7af')
-        korean_ratio = korean_chars / max(text_length, 1)
-        score += korean_ratio * 0.2
-
-        # Penalize excessive repetition
-        words = text.split()
-        if len(words) > 10:
-            unique_words = len(set(words))
-            word_diversity = unique_words / len(words)
-            score += word_diversity * 0.1
+    # Check for Korean content (basic heuristic)
+    korean_chars = _korean_char_count(codes)
+    korean_ratio = korean_chars / max(text_length, 1)
 
-    # Metadata completeness
-    metadata_fields = ['source', 'domain', 'lang', 'tokens']
-    completeness = sum(1 for field in metadata_fields if field in doc and doc[field])
-    score += (completeness / len(metadata_fields)) * 0.1
+    # Penalize excessive repetition
+    words = text.split()
+    diversity = len(set(words)) / len(words) if len(words) > 10 else 0.0
 
-    return score
+    return sentence_score, korean_ratio, diversity
 
 
 def analyze_cluster_statistics(clusters: List[List[Dict]]) -> Dict:
@@ -4,27 +4,29 @@
 from __future__ import annotations
 
 import argparse
-import json
-from pathlib import Path
-from typing import Dict, List, Tuple
+from collections import deque
+from typing import Deque, Dict, List, Tuple
 
 import ray
 
 from .slimpajama_dedup import (
     load_config,
-    build_minhash_index,
-    find_duplicate_clusters,
+    clusters_from_labels,
     deduplicate_documents,
+    drop_exact_duplicates,
+    index_and_cluster,
 )
+from utils.data_utils import dumps_json, iter_jsonl_chunks, loads_json
 
 
 @ray.remote
-def _process_chunk(lines: List[str], config: Dict) -> Tuple[List[Dict], List[List[str]], Dict]:
+def _process_chunk(lines: List[bytes], config: Dict) -> Tuple[List[Dict], List[List[str]], Dict]:
     """Process a data chunk and return deduped documents and stats."""
-    docs = [json.loads(line) for line in lines if line.strip()]
-    lsh, minhashes = build_minhash_index(docs, config)
-    clusters = find_duplicate_clusters(lsh, minhashes)
+    docs, exact_removed = drop_exact_duplicates([loads_json(line) for line in lines])
+    clusters = clusters_from_labels(index_and_cluster(docs, config))
     deduped, stats = deduplicate_documents(docs, clusters)
+    stats["original_count"] += exact_removed
+    stats["removed_count"] += exact_removed
     candidate_clusters = [list(cluster) for cluster in clusters]
     return deduped, candidate_clusters, stats
 
@@ -41,16 +43,10 @@ def run_dedup_ray(
 ) -> None:
     """Run deduplication using Ray for parallel processing."""
     config = load_config(config_path)
-    lines = Path(input_path).read_text(encoding="utf-8").splitlines()
-    chunks = [lines[i : i + chunk_size] for i in range(0, len(lines), chunk_size)]
 
     ray.init(local_mode=local, num_cpus=num_workers, ignore_reinit_error=True)
-    futures = [_process_chunk.remote(chunk, config) for chunk in chunks]
-    results = ray.get(futures)
-    ray.shutdown()
+    config_ref = ray.put(config)
 
-    deduped_docs: List[Dict] = []
-    all_candidates: List[List[str]] = []
     stats_total = {
         "original_count": 0,
         "deduplicated_count": 0,
@@ -58,11 +54,35 @@ def run_dedup_ray(
         "duplicate_clusters": 0,
     }
 
-    for docs, candidates, stats in results:
-        deduped_docs.extend(docs)
-        all_candidates.extend(candidates)
-        for key in stats_total:
-            stats_total[key] += stats.get(key, 0)
+    with open(output_path, "wb") as out_f, open(candidates_path, "wb") as cand_f:
+        first_cluster = True
+
+        def write_result(result: Tuple[List[Dict], List[List[str]], Dict]) -> None:
+            nonlocal first_cluster
+            docs, candidates, stats = result
+            out_f.writelines(dumps_json(doc) + b"\n" for doc in docs)
+            for cluster in candidates:
+                cand_f.write(b"[\n  " if first_cluster else b",\n  ")
+                cand_f.write(dumps_json(cluster))
+                first_cluster = False
+            for key in stats_total:
+                stats_total[key] += stats.get(key, 0)
+
+        # Keep at most ``2 * num_workers`` chunks in flight so reading the
+        # input overlaps with deduplication. Results are written as soon as
+        # the oldest chunk finishes, so the output follows the input order
+        # and the driver holds only the in-flight chunks.
+        max_in_flight = max(2 * num_workers, 1)
+        pending: Deque = deque()
+        for chunk in iter_jsonl_chunks(input_path, chunk_size):
+            if len(pending) >= max_in_flight:
+                write_result(ray.get(pending.popleft()))
+            pending.append(_process_chunk.remote(chunk, config_ref))
+        while pending:
+            write_result(ray.get(pending.popleft()))
+
+        cand_f.write(b"[]\n" if first_cluster else b"\n]\n")
+    ray.shutdown()
 
     stats_total["deduplication_rate"] = (
         stats_total["removed_count"] / stats_total["original_count"]
@@ -70,10 +90,6 @@ def run_dedup_ray(
         else 0
     )
 
-    with open(output_path, "w", encoding="utf-8") as out_f:
-        for doc in deduped_docs:
-            out_f.write(json.dumps(doc, ensure_ascii=False) + "\n")
-
     with open(log_csv, "w", encoding="utf-8") as log_f:
         headers = [
             "original_count",
@@ -85,9 +101,6 @@ def run_dedup_ray(
         log_f.write(",".join(headers) + "\n")
         log_f.write(",".join(str(stats_total[h]) for h in headers) + "\n")
 
-    with open(candidates_path, "w", encoding="utf-8") as cand_f:
-        json.dump(all_candidates, cand_f, ensure_ascii=False, indent=2)
-
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Distributed deduplication with Ray")
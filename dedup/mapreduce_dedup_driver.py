@@ -4,26 +4,33 @@
 from __future__ import annotations
 
 import argparse
-import json
 from multiprocessing import Pool
-from pathlib import Path
 from typing import Dict, List
 
 from .slimpajama_dedup import (
     load_config,
-    build_minhash_index,
-    find_duplicate_clusters,
+    clusters_from_labels,
     deduplicate_documents,
+    drop_exact_duplicates,
+    index_and_cluster,
 )
+from utils.data_utils import dumps_json, iter_jsonl_chunks, loads_json
 
 
-def _process_chunk(args: tuple[List[str], Dict]) -> List[Dict]:
+_WORKER_CONFIG: Dict = {}
+
+
+def _init_worker(config: Dict) -> None:
+    """Store the dedup config once per worker process."""
+    global _WORKER_CONFIG
+    _WORKER_CONFIG = config
+
+
+def _process_chunk(lines: List[bytes]) -> List[Dict]:
     """Process a single data chunk and return deduplicated documents."""
 
-    lines, config = args
-    docs = [json.loads(line) for line in lines if line.strip()]
-    lsh, minhashes = build_minhash_index(docs, config)
-    clusters, _ = find_duplicate_clusters(lsh, minhashes)
+    docs, _ = drop_exact_duplicates([loads_json(line) for line in lines])
+    clusters = clusters_from_labels(index_and_cluster(docs, _WORKER_CONFIG))
     deduped, _ = deduplicate_documents(docs, clusters)
     return deduped
 
@@ -38,21 +45,14 @@ def run_dedup_mapreduce(
     """Run the deduplication pipeline using a simple MapReduce approach."""
 
     config = load_config(config_path)
-    lines = Path(input_path).read_text(encoding="utf-8").splitlines()
-    chunks = [
-        lines[i:i + chunk_size] for i in range(0, len(lines), chunk_size)
-    ]
-
-    with Pool(processes=workers) as pool:
-        results = pool.map(
-            _process_chunk,
-            [(chunk, config) for chunk in chunks],
-        )
-
-    deduped_docs = [doc for part in results for doc in part]
-    with open(output_path, "w", encoding="utf-8") as out_f:
-        for doc in deduped_docs:
-            out_f.write(json.dumps(doc, ensure_ascii=False) + "\n")
+    chunks = iter_jsonl_chunks(input_path, chunk_size)
+
+    # The config is shipped once per worker, and each chunk's output is
+    # written as soon as it arrives, so the driver never buffers the corpus.
+    with Pool(processes=workers, initializer=_init_worker, initargs=(config,)) as pool, \
+            open(output_path, "wb") as out_f:
+        for deduped in pool.imap(_process_chunk, chunks):
+            out_f.writelines(dumps_json(doc) + b"\n" for doc in deduped)
 
 
 def main() -> None:
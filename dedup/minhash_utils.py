@@ -2,33 +2,57 @@
 MinHash utility functions for deduplication
 """
 
+import hashlib
 import re
-from typing import List, Set
+from functools import lru_cache
+from itertools import chain
+from typing import Iterable, Iterator, List, Optional, Sequence, Set, Sized, Tuple
+
+import numpy as np
+
+try:
+    import xxhash
+except Exception:  # pragma: no cover - optional dependency
+    xxhash = None
+try:
+    import cupy
+except Exception:  # pragma: no cover - optional dependency
+    cupy = None
 try:
     from datasketch import MinHash
 except Exception:  # pragma: no cover - fallback for environments without datasketch
     class MinHash:
         """Minimal fallback MinHash implementation for testing."""
 
-        def __init__(self, num_perm: int = 128) -> None:
+        def __init__(self, num_perm: int = 128, **kwargs) -> None:
             self.num_perm = num_perm
-            self._hashes = list(range(num_perm))
+            self._hashes = np.arange(num_perm, dtype=np.uint64)
 
         def update(self, value: bytes) -> None:  # type: ignore[override]
             _ = value
 
-        def digest(self) -> list[int]:
+        def digest(self) -> np.ndarray:
             return self._hashes
 
         def jaccard(self, other: "MinHash") -> float:
             """Estimate Jaccard similarity by comparing digests."""
-            other_digest = other.digest()
+            other_digest = np.asarray(other.digest(), dtype=np.uint64)
 
             if len(self._hashes) != len(other_digest):
                 raise ValueError("MinHash objects must use the same num_perm")
 
-            matches = sum(1 for a, b in zip(self._hashes, other_digest) if a == b)
-            return matches / len(self._hashes) if self._hashes else 0.0
+            if not len(self._hashes):
+                return 0.0
+            return np.count_nonzero(self._hashes == other_digest) / len(self._hashes)
+
+
+def _word_tokens(text: str) -> List[str]:
+    """Lower-cased whitespace tokens used for word n-grams"""
+    # ``islower`` is a read-only scan, so already-lowercase text skips the copy
+    tokens = (text if text.islower() else text.lower()).split()
+    if len(tokens) == 4 and tokens[-1].endswith("입니다"):
+        tokens.append(tokens[-1])
+    return tokens
 
 
 def tokenize_ngrams(text: str, n: int = 5) -> List[str]:
@@ -42,46 +66,93 @@ def tokenize_ngrams(text: str, n: int = 5) -> List[str]:
     Returns:
         List of n-gram strings
     """
-    tokens = text.lower().split()
-    if len(tokens) == 4 and tokens[-1].endswith("입니다"):
-        tokens.append(tokens[-1])
-
+    tokens = _word_tokens(text)
     if len(tokens) < n:
         return [' '.join(tokens)]
 
-    ngrams = []
-    for i in range(len(tokens) - n + 1):
-        ngram = ' '.join(tokens[i:i + n])
-        ngrams.append(ngram)
+    # Zip ``n`` shifted views of the token list instead of slicing per window
+    return list(map(' '.join, zip(*(tokens[i:] for i in range(n)))))
+
 
-    return ngrams
+_HANGUL_BASE = 0xAC00
+_HANGUL_COUNT = 11172
+# Sentinel for unused jamo slots; never a valid code point
+_NO_JAMO = 0xFFFFFFFF
+
+
+def _build_hangul_lut() -> np.ndarray:
+    """Build the ``(11172, 3)`` lead/vowel/tail jamo table for U+AC00..U+D7A3
+
+    Syllables without a final consonant store ``_NO_JAMO`` in the tail column.
+    """
+    idx = np.arange(_HANGUL_COUNT, dtype=np.uint32)
+    lut = np.empty((_HANGUL_COUNT, 3), dtype=np.uint32)
+    lut[:, 0] = 0x1100 + idx // 588
+    lut[:, 1] = 0x1161 + (idx % 588) // 28
+    lut[:, 2] = np.where(idx % 28, 0x11A7 + idx % 28, _NO_JAMO)
+    return lut
+
+
+_HANGUL_LUT = _build_hangul_lut()
+
+
+def _jamo_codes(text: str) -> np.ndarray:
+    """Code points of ``text`` with every Hangul syllable replaced by its jamo"""
+    codes = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    offsets = codes - np.uint32(_HANGUL_BASE)
+    is_hangul = offsets < _HANGUL_COUNT
+    if not is_hangul.any():
+        return codes
+
+    # Lay out three slots per character and drop the unused ones
+    slots = np.full((len(codes), 3), _NO_JAMO, dtype=np.uint32)
+    slots[:, 0] = codes
+    slots[is_hangul] = _HANGUL_LUT[offsets[is_hangul]]
+    return slots[slots != _NO_JAMO]
+
+
+def _decompose_jamo(text: str) -> str:
+    """Replace every precomposed Hangul syllable in ``text`` with its jamo"""
+    return _jamo_codes(text).tobytes().decode('utf-32-le', 'surrogatepass')
 
 
 def tokenize_jamo_ngrams(text: str, n: int = 3) -> List[str]:
     """Create jamo character n-grams from text."""
-    jamo_chars: List[str] = []
-
-    for char in text:
-        code = ord(char)
-        if 0xAC00 <= code <= 0xD7A3:
-            syllable_index = code - 0xAC00
-            lead = 0x1100 + syllable_index // 588
-            vowel = 0x1161 + (syllable_index % 588) // 28
-            tail_index = syllable_index % 28
-            jamo_chars.append(chr(lead))
-            jamo_chars.append(chr(vowel))
-            if tail_index:
-                jamo_chars.append(chr(0x11A7 + tail_index))
-        else:
-            jamo_chars.append(char)
+    jamo_text = _decompose_jamo(text)
 
-    if len(jamo_chars) < n:
-        return [''.join(jamo_chars)]
+    if len(jamo_text) < n:
+        return [jamo_text]
 
-    ngrams = []
-    for i in range(len(jamo_chars) - n + 1):
-        ngrams.append(''.join(jamo_chars[i:i + n]))
-    return ngrams
+    return [jamo_text[i:i + n] for i in range(len(jamo_text) - n + 1)]
+
+
+def _xxh3_32(value: bytes) -> int:
+    """32-bit xxh3 hash, a faster stand-in for datasketch's SHA1 default."""
+    return xxhash.xxh3_64_intdigest(value) & 0xFFFFFFFF
+
+
+def _minhash_kwargs() -> dict:
+    """Extra ``MinHash`` arguments; without xxhash datasketch keeps SHA1."""
+    return {'hashfunc': _xxh3_32} if xxhash is not None else {}
+
+
+@lru_cache(maxsize=16)
+def _empty_minhash(num_perm: int) -> MinHash:
+    """
+    Empty ``MinHash`` whose copies share its permutation coefficients
+
+    datasketch draws ``num_perm`` permutations from a fresh ``RandomState``
+    in every constructor; ``num_perm`` is fixed for a run, so they are drawn
+    once and reused through ``copy``.
+    """
+    return MinHash(num_perm=num_perm, **_minhash_kwargs())
+
+
+def _new_minhash(num_perm: int) -> MinHash:
+    template = _empty_minhash(num_perm)
+    if hasattr(template, 'copy'):
+        return template.copy()
+    return MinHash(num_perm=num_perm, **_minhash_kwargs())
 
 
 def create_minhash(ngrams: List[str], num_perm: int = 128) -> MinHash:
@@ -95,7 +166,33 @@ def create_minhash(ngrams: List[str], num_perm: int = 128) -> MinHash:
     Returns:
         MinHash object
     """
-    minhash = MinHash(num_perm=num_perm)
+    minhash = _new_minhash(num_perm)
+    encoded = [ngram.encode('utf-8') for ngram in ngrams]
+
+    if hasattr(minhash, 'update_batch'):
+        # One vectorized permutation pass over all n-gram hashes
+        minhash.update_batch(encoded)
+    else:
+        for value in encoded:
+            minhash.update(value)
+
+    return minhash
+
+
+def create_minhash_compat(ngrams: List[str], num_perm: int = 128) -> MinHash:
+    """
+    Create MinHash signature with one ``update`` call per n-gram
+
+    Reference implementation kept for parity checks against ``create_minhash``.
+
+    Args:
+        ngrams: List of n-gram strings
+        num_perm: Number of permutations for MinHash
+
+    Returns:
+        MinHash object
+    """
+    minhash = _new_minhash(num_perm)
 
     for ngram in ngrams:
         minhash.update(ngram.encode('utf-8'))
@@ -103,6 +200,536 @@ def create_minhash(ngrams: List[str], num_perm: int = 128) -> MinHash:
     return minhash
 
 
+_EMPTY_BIN = np.iinfo(np.uint64).max
+_MAX_DENSIFY_ROUNDS = 1 << 12
+_DONOR_TABLE_ROUNDS = 64
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _hash64(value: bytes) -> int:
+    """Hash ``value`` to an unsigned 64-bit integer."""
+    if xxhash is not None:
+        return xxhash.xxh64_intdigest(value)
+    return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), "little")
+
+
+def band_digest(band: bytes) -> bytes:
+    """Hash serialized LSH band values to a fixed 8-byte bucket key."""
+    if xxhash is not None:
+        return xxhash.xxh3_64_digest(band)
+    return hashlib.blake2b(band, digest_size=8).digest()
+
+
+def content_hash(text: str) -> int:
+    """Return a 128-bit hash of ``text`` for exact-duplicate detection."""
+    data = text.encode("utf-8", "surrogatepass")
+    if xxhash is not None:
+        return xxhash.xxh3_128_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=16).digest(), "little")
+
+
+def hash_ngrams(ngrams: Iterable[str], count: Optional[int] = None) -> np.ndarray:
+    """
+    Hash every n-gram exactly once
+
+    Args:
+        ngrams: Iterable of n-gram strings
+        count: Number of n-grams; required when ``ngrams`` has no ``len``
+
+    Returns:
+        ``np.uint64`` array with one hash per n-gram
+    """
+    if count is None:
+        count = len(ngrams)
+    # ``map`` keeps encoding and hashing in C when xxhash is available
+    return np.fromiter(map(_hash64, map(str.encode, ngrams)), dtype=np.uint64, count=count)
+
+
+# Bits per code point when packing jamo n-grams into one 64-bit key
+_CODE_POINT_BITS = 21
+
+
+def jamo_ngram_hashes(text: str, n: int = 3) -> np.ndarray:
+    """
+    Hash the jamo character n-grams of ``text`` without building n-gram strings
+
+    For ``n <= 3`` the code points of each window are packed into one 64-bit
+    key and mixed with a SplitMix64 finalizer, which is a bijection, so
+    distinct n-grams never collide. Larger ``n`` hash the strings from
+    ``tokenize_jamo_ngrams``. Either way the result has one hash per entry
+    of ``tokenize_jamo_ngrams(text, n)``.
+
+    Args:
+        text: Input text
+        n: N-gram size
+
+    Returns:
+        ``np.uint64`` array of n-gram hashes
+    """
+    if n * _CODE_POINT_BITS > 64:
+        return hash_ngrams(tokenize_jamo_ngrams(text, n))
+
+    codes = _jamo_codes(text).astype(np.uint64)
+    if len(codes) < n:
+        return hash_ngrams([codes.astype(np.uint32).tobytes().decode('utf-32-le', 'surrogatepass')])
+
+    width = len(codes) - n + 1
+    keys = codes[:width].copy()
+    for i in range(1, n):
+        keys <<= np.uint64(_CODE_POINT_BITS)
+        keys |= codes[i:i + width]
+    return _mix64(keys)
+
+
+def word_ngram_hashes(text: str, n: int = 5) -> np.ndarray:
+    """
+    Hash the word n-grams of ``text`` without building n-gram strings
+
+    Every token is hashed once; each window of ``n`` token hashes is then
+    folded left to right with a SplitMix64 round per token, one vectorized
+    pass per position. The result has one hash per entry of
+    ``tokenize_ngrams(text, n)``; texts shorter than ``n`` tokens hash
+    their single joined n-gram like ``hash_ngrams``.
+
+    Args:
+        text: Input text
+        n: N-gram size
+
+    Returns:
+        ``np.uint64`` array of n-gram hashes
+    """
+    tokens = _word_tokens(text)
+    if len(tokens) < n:
+        return hash_ngrams([' '.join(tokens)])
+
+    token_hashes = hash_ngrams(tokens)
+    width = len(tokens) - n + 1
+    keys = token_hashes[:width].copy()
+    with np.errstate(over='ignore'):
+        for i in range(1, n):
+            keys = _mix64(keys * _GOLDEN_GAMMA + token_hashes[i:i + width])
+    return keys
+
+
+def document_hashes(text: str, ngram_size: int = 5, jamo_ngram_size: int = 3) -> np.ndarray:
+    """
+    Hash the word n-grams and jamo n-grams of one document
+
+    Args:
+        text: Preprocessed document text
+        ngram_size: Word n-gram size
+        jamo_ngram_size: Jamo n-gram size
+
+    Returns:
+        ``np.uint64`` array of word n-gram hashes followed by jamo n-gram hashes
+    """
+    return np.concatenate((
+        word_ngram_hashes(text, ngram_size),
+        jamo_ngram_hashes(text, jamo_ngram_size),
+    ))
+
+
+def _mix64(x: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer applied element-wise to a ``np.uint64`` array."""
+    with np.errstate(over='ignore'):
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+def _probe_donors(bins: np.ndarray, attempt: int, num_perm: int, seed: int) -> np.ndarray:
+    """Bin probed by empty ``bins`` on the given (1-based) densification attempt."""
+    base = _mix64(bins.astype(np.uint64) ^ np.uint64(seed))
+    with np.errstate(over='ignore'):
+        probe = _mix64(base + np.uint64(attempt) * _GOLDEN_GAMMA)
+    return (probe % np.uint64(num_perm)).astype(np.int64)
+
+
+@lru_cache(maxsize=16)
+def _densify_donor_table(num_perm: int, seed: int) -> np.ndarray:
+    """
+    Precompute the first ``_DONOR_TABLE_ROUNDS`` probes of every bin
+
+    The probe sequence depends only on ``num_perm`` and ``seed``, which are
+    fixed for a whole run, so it is evaluated once per process instead of
+    being re-mixed for every signature.
+    """
+    bins = np.arange(num_perm, dtype=np.int64)
+    table = np.empty((num_perm, _DONOR_TABLE_ROUNDS), dtype=np.int64)
+    for attempt in range(_DONOR_TABLE_ROUNDS):
+        table[:, attempt] = _probe_donors(bins, attempt + 1, num_perm, seed)
+    table.setflags(write=False)
+    return table
+
+
+def _densify_rows(sigs: np.ndarray, seed: int = 1) -> np.ndarray:
+    """
+    Fill empty OPH bins of a signature matrix in place (optimal densification)
+
+    Each empty bin ``i`` probes bins ``h(i, attempt) mod num_perm`` until it
+    hits a non-empty one and borrows its value (Shrivastava, 2017). Rows
+    without any filled bin are left empty.
+    """
+    num_perm = sigs.shape[1]
+    filled = sigs != _EMPTY_BIN
+    rows, bins = np.nonzero(~filled & filled.any(axis=1, keepdims=True))
+    if not len(rows):
+        return sigs
+
+    table = _densify_donor_table(num_perm, seed)
+    attempt = 0
+    while len(rows) and attempt < _MAX_DENSIFY_ROUNDS:
+        if attempt < _DONOR_TABLE_ROUNDS:
+            donors = table[bins, attempt]
+        else:
+            donors = _probe_donors(bins, attempt + 1, num_perm, seed)
+        attempt += 1
+        hit = filled[rows, donors]
+        sigs[rows[hit], bins[hit]] = sigs[rows[hit], donors[hit]]
+        rows = rows[~hit]
+        bins = bins[~hit]
+
+    for row in np.unique(rows):  # pragma: no cover - astronomically unlikely
+        empty = bins[rows == row]
+        donors = np.flatnonzero(filled[row])
+        sigs[row, empty] = sigs[row, donors[np.searchsorted(donors, empty) % len(donors)]]
+    return sigs
+
+
+def _densify(sig: np.ndarray, seed: int = 1) -> np.ndarray:
+    """Fill empty bins of a single OPH signature in place."""
+    _densify_rows(sig[None, :], seed)
+    return sig
+
+
+def _oph_bins(hashes: np.ndarray, num_perm: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Split n-gram hashes into OPH bin indices and in-bin values."""
+    if num_perm & (num_perm - 1) == 0:
+        shift = np.uint64(num_perm.bit_length() - 1)
+        return (hashes & np.uint64(num_perm - 1)).astype(np.int64), hashes >> shift
+    return (hashes % np.uint64(num_perm)).astype(np.int64), hashes // np.uint64(num_perm)
+
+
+def create_minhash_oph(ngrams: Sequence[str], num_perm: int = 128, seed: int = 1) -> np.ndarray:
+    """
+    Create a One-Permutation Hashing (OPH) signature from n-grams
+
+    Every n-gram is hashed once, assigned to a bin by its low bits and the
+    minimum of the remaining bits is kept per bin. Empty bins are densified
+    so that signatures remain comparable position by position.
+
+    Args:
+        ngrams: List of n-gram strings
+        num_perm: Number of signature bins
+        seed: Seed for the densification probe sequence
+
+    Returns:
+        ``np.uint64`` array of length ``num_perm``
+    """
+    sig = np.full(num_perm, _EMPTY_BIN, dtype=np.uint64)
+    if not len(ngrams):
+        return sig
+
+    buckets, values = _oph_bins(hash_ngrams(ngrams), num_perm)
+    np.minimum.at(sig, buckets, values)
+    return _densify(sig, seed)
+
+
+def _row_offsets(rows: Sequence[Sized]) -> np.ndarray:
+    """Start offsets of each row in the flattened rows, plus the total length"""
+    counts = np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def _concat_hashes(hash_arrays: Sequence[np.ndarray]) -> np.ndarray:
+    """Flatten per-document hash arrays into one ``np.uint64`` array"""
+    if not len(hash_arrays):
+        return np.empty(0, dtype=np.uint64)
+    return np.concatenate(hash_arrays).astype(np.uint64, copy=False)
+
+
+def _oph_reduce(hashes: np.ndarray, offsets: np.ndarray, num_perm: int) -> np.ndarray:
+    """Min-reduce flat n-gram hashes into per-document OPH bins."""
+    num_docs = len(offsets) - 1
+    sigs = np.full((num_docs, num_perm), _EMPTY_BIN, dtype=np.uint64)
+    if not len(hashes):
+        return sigs
+
+    buckets, values = _oph_bins(hashes, num_perm)
+    rows = np.repeat(np.arange(num_docs, dtype=np.int64), np.diff(offsets))
+    np.minimum.at(sigs.reshape(-1), rows * num_perm + buckets, values)
+    return sigs
+
+
+def create_minhash_oph_batch(
+    ngram_lists: Sequence[Sequence[str]],
+    num_perm: int = 128,
+    seed: int = 1,
+) -> np.ndarray:
+    """
+    Create OPH signatures for many documents at once
+
+    N-grams of all documents are hashed into one flat array with per-document
+    offsets and min-reduced into every row with a single vectorized scatter.
+    Row ``i`` equals ``create_minhash_oph(ngram_lists[i], num_perm, seed)``.
+
+    Args:
+        ngram_lists: One list of n-gram strings per document
+        num_perm: Number of signature bins
+        seed: Seed for the densification probe sequence
+
+    Returns:
+        ``(len(ngram_lists), num_perm)`` ``np.uint64`` signature matrix
+    """
+    offsets = _row_offsets(ngram_lists)
+    hashes = hash_ngrams(chain.from_iterable(ngram_lists), count=int(offsets[-1]))
+
+    return _densify_rows(_oph_reduce(hashes, offsets, num_perm), seed)
+
+
+def create_minhash_oph_batch_from_hashes(
+    hash_arrays: Sequence[np.ndarray],
+    num_perm: int = 128,
+    seed: int = 1,
+) -> np.ndarray:
+    """
+    Create OPH signatures from already hashed n-grams
+
+    Same as ``create_minhash_oph_batch`` but takes one ``np.uint64`` hash
+    array per document, e.g. from ``document_hashes``.
+
+    Args:
+        hash_arrays: One array of n-gram hashes per document
+        num_perm: Number of signature bins
+        seed: Seed for the densification probe sequence
+
+    Returns:
+        ``(len(hash_arrays), num_perm)`` ``np.uint64`` signature matrix
+    """
+    offsets = _row_offsets(hash_arrays)
+    hashes = _concat_hashes(hash_arrays)
+
+    return _densify_rows(_oph_reduce(hashes, offsets, num_perm), seed)
+
+
+def narrow_signatures(sigs: np.ndarray) -> np.ndarray:
+    """
+    Keep the low 32 bits of every signature value as ``np.uint32``
+
+    Equality of 32-bit values is all that LSH banding and Jaccard estimation
+    need; a chance collision costs ``2 ** -32`` per position. This halves
+    signature memory and band key bytes.
+
+    Args:
+        sigs: Signature array of any shape
+
+    Returns:
+        ``np.uint32`` array of the same shape
+    """
+    sigs = np.asarray(sigs)
+    if sigs.dtype == np.uint32:
+        return sigs
+    return (sigs & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+
+@lru_cache(maxsize=16)
+def _permutation_params(num_perm: int, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Random odd multipliers and offsets for multiply-shift hashing."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, 1 << 64, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, 1 << 64, size=num_perm, dtype=np.uint64)
+    a.setflags(write=False)
+    b.setflags(write=False)
+    return a, b
+
+
+def create_minhash_perm_batch(
+    ngram_lists: Sequence[Sequence[str]],
+    num_perm: int = 128,
+    seed: int = 1,
+    block_size: int = 1 << 13,
+) -> np.ndarray:
+    """
+    Create classic ``num_perm``-permutation MinHash signatures for many documents
+
+    Every n-gram is hashed once. The ``num_perm`` permutations are then
+    applied to all hashes at once by broadcasting ``(a * h + b) >> 32``
+    (multiply-shift hashing). Each document's rows are min-reduced with
+    ``np.minimum.reduceat``. Documents are processed in groups of about
+    ``block_size`` n-grams, which bounds the broadcast temporary.
+
+    Args:
+        ngram_lists: One list of n-gram strings per document
+        num_perm: Number of permutations
+        seed: Seed for the permutation parameters
+        block_size: Approximate number of n-grams permuted at once
+
+    Returns:
+        ``(len(ngram_lists), num_perm)`` ``np.uint32`` signature matrix (the
+        shifted permutation values fit in 32 bits); rows of documents
+        without n-grams stay at ``np.iinfo(np.uint32).max``
+    """
+    offsets = _row_offsets(ngram_lists)
+    hashes = hash_ngrams(chain.from_iterable(ngram_lists), count=int(offsets[-1]))
+    return _perm_signatures(hashes, offsets, num_perm, seed, block_size)
+
+
+def create_minhash_perm_batch_from_hashes(
+    hash_arrays: Sequence[np.ndarray],
+    num_perm: int = 128,
+    seed: int = 1,
+    block_size: int = 1 << 13,
+) -> np.ndarray:
+    """
+    Create permutation MinHash signatures from already hashed n-grams
+
+    Same as ``create_minhash_perm_batch`` but takes one ``np.uint64`` hash
+    array per document, e.g. from ``document_hashes``.
+
+    Args:
+        hash_arrays: One array of n-gram hashes per document
+        num_perm: Number of permutations
+        seed: Seed for the permutation parameters
+        block_size: Approximate number of n-grams permuted at once
+
+    Returns:
+        ``(len(hash_arrays), num_perm)`` ``np.uint32`` signature matrix
+    """
+    return _perm_signatures(_concat_hashes(hash_arrays), _row_offsets(hash_arrays), num_perm, seed, block_size)
+
+
+_PERM_MINHASH_CUDA = r'''
+extern "C" __global__
+void perm_minhash(const unsigned long long* hashes, const long long* offsets,
+                  const unsigned long long* a, const unsigned long long* b,
+                  unsigned int* sigs, int num_perm) {
+    long long doc = blockIdx.x;
+    long long lo = offsets[doc], hi = offsets[doc + 1];
+    for (int p = threadIdx.x; p < num_perm; p += blockDim.x) {
+        unsigned long long ap = a[p], bp = b[p];
+        unsigned int best = 0xFFFFFFFFu;
+        for (long long i = lo; i < hi; ++i) {
+            unsigned int v = (unsigned int)((hashes[i] * ap + bp) >> 32);
+            best = v < best ? v : best;
+        }
+        sigs[doc * num_perm + p] = best;
+    }
+}
+'''
+
+
+@lru_cache(maxsize=None)
+def _perm_minhash_kernel():
+    """Compile the CUDA permutation MinHash kernel once per process"""
+    return cupy.RawKernel(_PERM_MINHASH_CUDA, 'perm_minhash')
+
+
+def create_minhash_perm_batch_gpu(
+    hash_arrays: Sequence[np.ndarray],
+    num_perm: int = 128,
+    seed: int = 1,
+) -> np.ndarray:
+    """
+    Create permutation MinHash signatures on a CUDA device with CuPy
+
+    One thread block handles one document, and each thread keeps the
+    running minimum of its permutations over the document's hashes. The
+    output equals ``create_minhash_perm_batch_from_hashes``; it only pays
+    off for large batches, where the ``(n-grams, num_perm)`` products
+    dominate.
+
+    Args:
+        hash_arrays: One array of n-gram hashes per document
+        num_perm: Number of permutations
+        seed: Seed for the permutation parameters
+
+    Returns:
+        ``(len(hash_arrays), num_perm)`` ``np.uint32`` signature matrix
+    """
+    if cupy is None:
+        raise ImportError("cupy is required for GPU signature computation")
+
+    num_docs = len(hash_arrays)
+    if not num_docs:
+        return np.empty((0, num_perm), dtype=np.uint32)
+    a, b = _permutation_params(num_perm, seed)
+    sigs = cupy.empty((num_docs, num_perm), dtype=cupy.uint32)
+    _perm_minhash_kernel()(
+        (num_docs,),
+        (min(num_perm, 256),),
+        (
+            cupy.asarray(_concat_hashes(hash_arrays)),
+            cupy.asarray(_row_offsets(hash_arrays)),
+            cupy.asarray(a),
+            cupy.asarray(b),
+            sigs,
+            np.int32(num_perm),
+        ),
+    )
+    return cupy.asnumpy(sigs)
+
+
+def _unique_per_row(hashes: np.ndarray, offsets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Drop repeated hashes within each document of a flat hash array
+
+    A repeated n-gram cannot lower a minimum, so permuting it again is
+    wasted work; documents repeat many short jamo n-grams.
+    """
+    # Per-document sorts are much cheaper than one lexsort over (row, hash)
+    rows = [np.unique(hashes[lo:hi]) for lo, hi in zip(offsets[:-1], offsets[1:])]
+    return _concat_hashes(rows), _row_offsets(rows)
+
+
+def _perm_signatures(
+    hashes: np.ndarray, offsets: np.ndarray, num_perm: int, seed: int, block_size: int
+) -> np.ndarray:
+    """Min-reduce permuted flat n-gram hashes into per-document signatures"""
+    hashes, offsets = _unique_per_row(hashes, offsets)
+    counts = np.diff(offsets)
+    a, b = _permutation_params(num_perm, seed)
+    num_docs = len(counts)
+    sigs = np.full((num_docs, num_perm), np.iinfo(np.uint32).max, dtype=np.uint32)
+    start = 0
+    while start < num_docs:
+        stop = int(np.searchsorted(offsets, offsets[start] + block_size, side='right')) - 1
+        stop = min(max(stop, start + 1), num_docs)
+        rows = np.flatnonzero(counts[start:stop]) + start
+        if len(rows):
+            lo, hi = offsets[start], offsets[stop]
+            with np.errstate(over='ignore'):
+                permuted = (hashes[lo:hi, None] * a + b) >> np.uint64(32)
+            sigs[rows] = np.minimum.reduceat(permuted, offsets[rows] - lo, axis=0).astype(np.uint32)
+        start = stop
+    return sigs
+
+
+class OPHMinHash:
+    """
+    Lightweight MinHash-like wrapper around an OPH signature row
+
+    Exposes ``hashvalues``, ``digest``, ``jaccard`` and ``len`` so it can be
+    inserted into and queried against ``datasketch.MinHashLSH``.
+    """
+
+    __slots__ = ('hashvalues', 'seed')
+
+    def __init__(self, hashvalues: np.ndarray, seed: int = 1) -> None:
+        self.hashvalues = np.asarray(hashvalues, dtype=np.uint64)
+        self.seed = seed
+
+    def __len__(self) -> int:
+        return len(self.hashvalues)
+
+    def digest(self) -> np.ndarray:
+        return self.hashvalues
+
+    def jaccard(self, other) -> float:
+        return estimate_jaccard_similarity(self, other)
+
+
 def jaccard_similarity(set1: Set[str], set2: Set[str]) -> float:
     """
     Calculate Jaccard similarity between two sets
@@ -128,17 +755,231 @@ def estimate_jaccard_similarity(minhash1: MinHash, minhash2: MinHash) -> float:
     Estimate Jaccard similarity using MinHash
 
     Args:
-        minhash1: First MinHash
-        minhash2: Second MinHash
+        minhash1: First MinHash (or ``np.uint64`` signature array)
+        minhash2: Second MinHash (or ``np.uint64`` signature array)
 
     Returns:
         Estimated Jaccard similarity
     """
-    digest1 = minhash1.digest()
-    digest2 = minhash2.digest()
+    digest1 = _as_signature(minhash1)
+    digest2 = _as_signature(minhash2)
 
     if len(digest1) != len(digest2):
         raise ValueError("MinHash objects must have the same number of permutations")
 
-    matches = sum(1 for h1, h2 in zip(digest1, digest2) if h1 == h2)
-    return matches / len(digest1) if digest1 else 0.0
+    if not len(digest1):
+        return 0.0
+    return np.count_nonzero(digest1 == digest2) / len(digest1)
+
+
+def pack_bbit(sigs: np.ndarray, b: int = 8) -> np.ndarray:
+    """
+    Keep only the low ``b`` bits of every signature value (b-bit MinHash)
+
+    Args:
+        sigs: ``np.uint64`` signature array of any shape
+        b: Bits to keep per value, between 1 and 16
+
+    Returns:
+        ``np.uint8`` array for ``b <= 8``, otherwise ``np.uint16``
+    """
+    if not 1 <= b <= 16:
+        raise ValueError("b must be between 1 and 16")
+    mask = np.uint64((1 << b) - 1)
+    dtype = np.uint8 if b <= 8 else np.uint16
+    return (np.asarray(sigs, dtype=np.uint64) & mask).astype(dtype)
+
+
+def _iter_jaccard_tiles(
+    sigs: np.ndarray, block_size: int, bits: Optional[int], upper: bool = False
+) -> Iterator[Tuple[int, int, np.ndarray]]:
+    """
+    Yield ``(row, col, similarities)`` for each ``block_size`` tile of ``sigs``
+
+    With ``upper`` set, tiles entirely below the diagonal are skipped.
+    """
+    n, num_perm = sigs.shape
+    collision = 2.0 ** -bits if bits is not None else 0.0
+    for row in range(0, n, block_size):
+        rows = sigs[row:row + block_size, None, :]
+        for col in range(row if upper else 0, n, block_size):
+            cols = sigs[None, col:col + block_size, :]
+            tile = np.count_nonzero(rows == cols, axis=-1) / num_perm
+            if bits is not None:
+                tile = np.clip((tile - collision) / (1.0 - collision), 0.0, 1.0)
+            yield row, col, tile
+
+
+def batch_jaccard(
+    sigs: np.ndarray, block_size: int = 128, bits: Optional[int] = None
+) -> np.ndarray:
+    """
+    Estimate all-pairs Jaccard similarity for a signature matrix
+
+    The comparison is tiled into ``block_size`` x ``block_size`` blocks so the
+    broadcast temporaries stay cache-sized regardless of the number of rows.
+
+    Args:
+        sigs: ``(N, num_perm)`` signature matrix
+        block_size: Tile edge length in rows
+        bits: Set when ``sigs`` came from ``pack_bbit(..., b=bits)`` to remove
+            the ``2 ** -bits`` chance of unrelated values colliding
+
+    Returns:
+        ``(N, N)`` float32 matrix of estimated similarities
+    """
+    sigs = np.asarray(sigs)
+    n, num_perm = sigs.shape
+    sims = np.zeros((n, n), dtype=np.float32)
+    if not num_perm:
+        return sims
+
+    for row, col, tile in _iter_jaccard_tiles(sigs, block_size, bits):
+        sims[row:row + block_size, col:col + block_size] = tile
+    return sims
+
+
+def similar_pairs(
+    sigs: np.ndarray,
+    threshold: float,
+    block_size: int = 128,
+    bits: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find every pair of rows whose estimated Jaccard similarity meets ``threshold``
+
+    Tiles are thresholded as they are produced, so the full ``(N, N)`` matrix
+    is never materialized.
+
+    Args:
+        sigs: ``(N, num_perm)`` signature matrix
+        threshold: Minimum estimated similarity for a pair
+        block_size: Tile edge length in rows
+        bits: Bit width if ``sigs`` were packed with ``pack_bbit``
+
+    Returns:
+        Tuple of ``np.int32`` arrays ``(src, dst)`` with ``src < dst``
+    """
+    sigs = np.asarray(sigs)
+    src: List[np.ndarray] = []
+    dst: List[np.ndarray] = []
+    if sigs.shape[1]:
+        for row, col, tile in _iter_jaccard_tiles(sigs, block_size, bits, upper=True):
+            i, j = np.nonzero(tile >= threshold)
+            i += row
+            j += col
+            upper = i < j
+            src.append(i[upper])
+            dst.append(j[upper])
+    if not src:
+        empty = np.empty(0, dtype=np.int32)
+        return empty, empty
+    return np.concatenate(src).astype(np.int32), np.concatenate(dst).astype(np.int32)
+
+
+@lru_cache(maxsize=64)
+def optimal_lsh_params(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    Pick ``(bands, rows)`` minimizing the equally weighted false positive and
+    false negative probability mass, as ``datasketch.MinHashLSH`` does
+
+    Args:
+        threshold: Target Jaccard similarity
+        num_perm: Signature length
+
+    Returns:
+        Tuple of (number of bands, rows per band)
+    """
+    pairs = np.array(
+        [(b, r) for b in range(1, num_perm + 1) for r in range(1, num_perm // b + 1)],
+        dtype=np.float64,
+    )
+    bands, rows = pairs[:, :1], pairs[:, 1:]
+
+    def collision_mass(lo: float, hi: float, complement: bool) -> np.ndarray:
+        # Trapezoidal integral of the band collision probability over [lo, hi]
+        grid = np.linspace(lo, hi, 1001)
+        prob = 1.0 - (1.0 - grid ** rows) ** bands
+        if complement:
+            prob = 1.0 - prob
+        return (prob[:, 1:] + prob[:, :-1]).sum(axis=1) * (hi - lo) / 2000
+
+    error = 0.5 * collision_mass(0.0, threshold, False) + 0.5 * collision_mass(threshold, 1.0, True)
+    best = pairs[int(np.argmin(error))]
+    return int(best[0]), int(best[1])
+
+
+def _band_keys(block: np.ndarray) -> np.ndarray:
+    """Hash every row of a ``(N, rows)`` band to one ``np.uint64`` key"""
+    # Polynomial hash with wrapping uint64 arithmetic; equal rows always
+    # share a key, and collisions are resolved by the caller
+    powers = _GOLDEN_GAMMA ** np.arange(block.shape[1], dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        return (block.astype(np.uint64) * powers).sum(axis=1, dtype=np.uint64)
+
+
+def lsh_band_pairs(
+    sigs: np.ndarray, threshold: float, params: Optional[Tuple[int, int]] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find LSH candidate pairs by banding a whole signature matrix at once
+
+    Each band's rows are hashed to ``np.uint64`` keys and sorted; rows
+    sharing a key in any band become candidates. Shared keys are checked
+    against the band values, and a band with a key collision is re-sorted
+    by its raw bytes, so the result is exact. Every member of a bucket is
+    linked to the bucket's first row, which keeps the edge list linear in
+    the bucket size while preserving connectivity.
+
+    Args:
+        sigs: ``(N, num_perm)`` signature matrix
+        threshold: Target Jaccard similarity, used to pick the banding
+        params: Explicit ``(bands, rows)`` overriding ``optimal_lsh_params``
+
+    Returns:
+        Tuple of ``np.int32`` arrays ``(src, dst)``
+    """
+    sigs = np.asarray(sigs)
+    n, num_perm = sigs.shape
+    bands, rows = params or optimal_lsh_params(threshold, num_perm)
+    src: List[np.ndarray] = []
+    dst: List[np.ndarray] = []
+    if n < 2:
+        empty = np.empty(0, dtype=np.int32)
+        return empty, empty
+
+    for band in range(bands):
+        block = sigs[:, band * rows:(band + 1) * rows]
+        keys = _band_keys(block)
+        order = np.argsort(keys, kind='stable')
+        ordered = keys[order]
+        same = ordered[1:] == ordered[:-1]
+        if not same.any():
+            continue
+        shared = np.flatnonzero(same)
+        if not (block[order[shared]] == block[order[shared + 1]]).all():
+            # Genuine key collision: sort this band by its raw bytes instead
+            exact = np.ascontiguousarray(block)
+            keys = exact.view(np.dtype((np.void, exact.dtype.itemsize * rows))).ravel()
+            order = np.argsort(keys, kind='stable')
+            ordered = keys[order]
+            same = ordered[1:] == ordered[:-1]
+            if not same.any():
+                continue
+        # Position of each row's bucket head within ``order``
+        starts = np.where(np.concatenate(([True], ~same)), np.arange(n), 0)
+        heads = np.maximum.accumulate(starts)
+        members = np.flatnonzero(np.concatenate(([False], same)))
+        src.append(order[heads[members]])
+        dst.append(order[members])
+
+    if not src:
+        empty = np.empty(0, dtype=np.int32)
+        return empty, empty
+    return np.concatenate(src).astype(np.int32), np.concatenate(dst).astype(np.int32)
+
+
+def _as_signature(minhash) -> np.ndarray:
+    """Return the hash values of a MinHash-like object or raw signature."""
+    digest = minhash.digest() if hasattr(minhash, 'digest') else minhash
+    return np.asarray(digest, dtype=np.uint64)
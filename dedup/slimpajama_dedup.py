@@ -7,16 +7,17 @@ Implements MinHash + LSH for near-duplicate detection and removal.
 import json
 import logging
 import os
+import pickle
+import tempfile
 import time
 import io
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from itertools import compress, islice
+from multiprocessing import Pool
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import argparse
 
-try:
-    import pandas as pd
-except Exception:  # pragma: no cover - optional dependency
-    pd = None
+import numpy as np
 
 try:
     from datasketch import MinHash, MinHashLSH
@@ -32,14 +33,31 @@ except Exception:  # pragma: no cover - fallback for environments without datask
             return list(range(self.num_perm))
 
     class MinHashLSH:
-        def __init__(self, threshold: float = 0.8, num_perm: int = 128, storage_config=None) -> None:
+        def __init__(
+            self, threshold: float = 0.8, num_perm: int = 128, storage_config=None, hashfunc=None
+        ) -> None:
             self.data: dict[str, list[MinHash]] = {}
 
         def insert(self, key: str, mh: MinHash) -> None:
             self.data.setdefault(key, []).append(mh)
 
+        def insertion_session(self, buffer_size: int = 50000) -> "MinHashLSH":
+            return self
+
+        def __enter__(self) -> "MinHashLSH":
+            return self
+
+        def __exit__(self, *exc) -> None:
+            return None
+
         def query(self, mh: MinHash) -> list[str]:
             return list(self.data.keys())
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import connected_components
+except Exception:  # pragma: no cover - optional dependency
+    csr_matrix = None
+    connected_components = None
 try:
     from tqdm import tqdm
 except Exception:  # pragma: no cover - fallback for environments without tqdm
@@ -56,9 +74,17 @@ except Exception:  # pragma: no cover - fallback if pyyaml missing
     yaml = _DummyYAML()
 
 from .minhash_utils import (
-    create_minhash,
-    tokenize_ngrams,
-    tokenize_jamo_ngrams,
+    OPHMinHash,
+    band_digest,
+    content_hash,
+    create_minhash_oph_batch_from_hashes,
+    create_minhash_perm_batch_from_hashes,
+    create_minhash_perm_batch_gpu,
+    document_hashes,
+    lsh_band_pairs,
+    narrow_signatures,
+    pack_bbit,
+    similar_pairs,
 )
 try:
     import redis
@@ -71,13 +97,25 @@ except Exception:  # pragma: no cover - fallback if redis missing
         def set(self, *args, **kwargs) -> None:
             return None
 
+        def hset(self, *args, **kwargs) -> None:
+            return None
+
+        def pipeline(self, transaction: bool = True) -> "_DummyRedis":
+            return self
+
+        def execute(self) -> list:
+            return []
+
     class _RedisModule:
         Redis = _DummyRedis
 
     redis = _RedisModule()
-from .cluster_reduction import select_representative_document
+from .cluster_reduction import document_lengths
 from utils.cloud_storage import get_storage_client
 from utils.data_utils import (
+    dumps_json,
+    loads_json,
+    normalize_text,
     validate_jsonl_format,
     validate_json,
     normalize_document,
@@ -107,19 +145,26 @@ def validate_cloud_jsonl_file(storage_client, file_path: str, sample_size: int =
     """
     Validate JSONL file format from cloud storage and return sample documents
 
+    Only the first ``sample_size`` lines are checked, so only those are
+    read; the full file is streamed once, later, by the cleaning pass.
+
     Args:
         storage_client: Cloud storage client
         file_path: Path to JSONL file in cloud storage
         sample_size: Number of samples to return for inspection
 
     Returns:
-        Tuple of (is_valid, total_lines, sample_documents)
+        Tuple of (is_valid, valid sampled lines, sample texts)
     """
     logger = logging.getLogger(__name__)
 
     try:
-        # Read file content from cloud storage
-        file_content = storage_client.read_text_file(file_path)
+        # Read just the lines to be checked from cloud storage
+        lines = storage_client.stream_file_lines(file_path)
+        try:
+            file_content = '\n'.join(islice(lines, sample_size))
+        finally:
+            lines.close()
 
         # Validate using the utility function
         is_valid, validation_info = validate_jsonl_format(file_content, sample_size)
@@ -137,6 +182,60 @@ def validate_cloud_jsonl_file(storage_client, file_path: str, sample_size: int =
         return False, 0, []
 
 
+def _clean_batch(args: Tuple[List[Dict], List[str]]) -> Tuple[List[Dict], int]:
+    """Validate and normalize one batch of documents (runs in a worker)"""
+    docs, required_fields = args
+    cleaned: List[Dict] = []
+    invalid = 0
+    for doc in docs:
+        is_valid, _ = validate_json(doc, required_fields)
+        if is_valid:
+            cleaned.append(normalize_document(doc))
+        else:
+            invalid += 1
+    return cleaned, invalid
+
+
+def iter_clean_batches(
+    records: Iterable[Dict],
+    required_fields: List[str],
+    workers: int = 1,
+    batch_size: int = 256,
+) -> Iterator[Tuple[List[Dict], int]]:
+    """
+    Validate and normalize streamed documents, in parallel when ``workers > 1``
+
+    Records are grouped into ``batch_size`` batches and fed lazily to an
+    ordered ``Pool.imap``, so reading the input overlaps with cleaning and
+    the output keeps the input order.
+
+    Args:
+        records: Parsed JSON documents
+        required_fields: Fields every valid document must contain
+        workers: Number of worker processes
+        batch_size: Documents per batch sent to a worker
+
+    Yields:
+        Tuples of (cleaned documents, number of invalid documents) per batch
+    """
+    batches = ((batch, required_fields) for batch in _batched(records, batch_size))
+    if workers <= 1:
+        yield from map(_clean_batch, batches)
+        return
+    with Pool(processes=workers) as pool:
+        yield from pool.imap(_clean_batch, batches)
+
+
+def _batched(iterable: Iterable, size: int) -> Iterator[List]:
+    """Yield consecutive lists of at most ``size`` items"""
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
 def preprocess_text(text: str) -> str:
     """
     Preprocess text for deduplication
@@ -147,18 +246,259 @@ def preprocess_text(text: str) -> str:
     Returns:
         Preprocessed text
     """
-    import unicodedata
-
-    # Normalize unicode
-    text = unicodedata.normalize('NFKC', text)
-
-    # Remove extra whitespace
-    text = ' '.join(text.split())
+    # Shared with document cleaning: NFKC plus whitespace collapsing
+    text = normalize_text(text)
 
     # Remove common noise patterns (optional)
     # You can add more preprocessing here
 
-    return text.strip()
+    return text
+
+
+_SIGNATURE_BUILDERS = {
+    'oph': create_minhash_oph_batch_from_hashes,
+    'permutation': create_minhash_perm_batch_from_hashes,
+}
+
+
+def _narrowed(build_signatures):
+    """Wrap a signature builder so it returns ``np.uint32`` signatures"""
+    def build(hash_arrays: List[np.ndarray], num_perm: int) -> np.ndarray:
+        return narrow_signatures(build_signatures(hash_arrays, num_perm))
+    return build
+
+
+def _lsh_storage_config(config: Dict) -> Dict:
+    """Build the datasketch Redis storage config from the dedup config"""
+    redis_cfg = config.get('redis', {})
+    return {
+        'type': 'redis',
+        'basename': redis_cfg.get('prefix', 'dedup').encode(),
+        'redis': {
+            'host': redis_cfg.get('host', 'localhost'),
+            'port': int(redis_cfg.get('port', 6379)),
+        },
+    }
+
+
+def _new_lsh_index(threshold: float, num_perm: int, storage_config: Dict) -> MinHashLSH:
+    """
+    Create the Redis-backed LSH index
+
+    Band values are hashed to 8-byte bucket keys with ``band_digest``
+    instead of being stored raw (8 bytes per signature row in each band).
+    """
+    return MinHashLSH(
+        threshold=threshold,
+        num_perm=num_perm,
+        storage_config=storage_config,
+        hashfunc=band_digest,
+    )
+
+
+def _signature_builder(config: Dict):
+    """Select the batch signature function described by the config"""
+    scheme = config.get('signature_scheme', 'oph')
+    if scheme not in _SIGNATURE_BUILDERS:
+        raise ValueError(f"Unknown signature_scheme: {scheme}")
+    build_signatures = _SIGNATURE_BUILDERS[scheme]
+    device = config.get('signature_device', 'cpu')
+    if device not in ('cpu', 'gpu'):
+        raise ValueError(f"Unknown signature_device: {device}")
+    if device == 'gpu':
+        if scheme != 'permutation':
+            raise ValueError("signature_device 'gpu' requires signature_scheme 'permutation'")
+        build_signatures = create_minhash_perm_batch_gpu
+    signature_bits = config.get('signature_bits', 32)
+    if signature_bits not in (32, 64):
+        raise ValueError(f"signature_bits must be 32 or 64, got {signature_bits}")
+    if signature_bits == 32:
+        build_signatures = _narrowed(build_signatures)
+    return build_signatures
+
+
+def _signature_batch(args: Tuple[List[Dict], int, Dict, bool]) -> Tuple[List[int], np.ndarray]:
+    """Compute signatures for one slice of documents (runs in a worker)
+
+    The last element of ``args`` says whether the texts were already
+    normalized by ``normalize_document``, in which case ``preprocess_text``
+    (the same normalization) is not applied again.
+    """
+    documents, first_id, config, normalized = args
+    num_perm = config.get('minhash_permutations', 128)
+    ngram_size = config.get('ngram_size', 5)
+    jamo_ngram_size = config.get('jamo_ngram_size', 3)
+
+    doc_ids: List[int] = []
+    hash_arrays: List[np.ndarray] = []
+    for doc_id, doc in enumerate(documents, first_id):
+        # preprocess_text already strips surrounding whitespace
+        text = doc.get('text', '')
+        if not normalized:
+            text = preprocess_text(text)
+
+        if len(text) < 10:  # Skip very short texts
+            continue
+
+        # Hash word and jamo n-grams; signatures are computed per batch
+        hashes = document_hashes(text, ngram_size, jamo_ngram_size)
+        if len(hashes) < 5:
+            continue
+
+        doc_ids.append(doc_id)
+        hash_arrays.append(hashes)
+
+    return doc_ids, _signature_builder(config)(hash_arrays, num_perm)
+
+
+def _iter_signature_batches(
+    documents: List[Dict], config: Dict
+) -> Iterator[Tuple[List[int], np.ndarray]]:
+    """
+    Compute OPH signatures for every indexable document, one batch at a time
+
+    Very short texts and texts with too few n-grams are skipped. The
+    ``signature_scheme`` config key selects one-permutation hashing
+    (``'oph'``, default) or classic ``num_perm``-permutation MinHash
+    (``'permutation'``); ``signature_device: gpu`` computes the latter on a
+    CUDA device with CuPy. With ``signature_bits: 32`` (default) signatures
+    are narrowed to ``np.uint32``; ``64`` keeps full-width values.
+
+    Slices of ``signature_batch_size`` documents are hashed in
+    ``signature_workers`` processes (default 1, in-process) through an
+    ordered ``Pool.imap``, so batches arrive in document order.
+
+    Args:
+        documents: List of document dictionaries
+        config: Configuration dictionary
+
+    Yields:
+        Tuples of (document indices, ``(len(indices), num_perm)`` signatures)
+    """
+    _signature_builder(config)  # fail fast on a bad config
+    batch_size = config.get('signature_batch_size', 1024)
+    workers = config.get('signature_workers', 1)
+
+    tasks = (
+        (documents[start:start + batch_size], start, config, False)
+        for start in range(0, len(documents), batch_size)
+    )
+    num_batches = -(-len(documents) // batch_size)
+    if workers <= 1:
+        results = map(_signature_batch, tasks)
+        yield from (batch for batch in tqdm(results, total=num_batches, desc="Creating MinHashes") if batch[0])
+        return
+    with Pool(processes=workers) as pool:
+        results = pool.imap(_signature_batch, tasks)
+        yield from (batch for batch in tqdm(results, total=num_batches, desc="Creating MinHashes") if batch[0])
+
+
+def _clean_and_sign_batch(
+    args: Tuple[List[Dict], List[str], Dict]
+) -> Tuple[List[Dict], int, List[int], np.ndarray]:
+    """Clean one batch and compute its signatures (runs in a worker)"""
+    docs, required_fields, config = args
+    cleaned, invalid = _clean_batch((docs, required_fields))
+    doc_ids, signatures = _signature_batch((cleaned, 0, config, True))
+    return cleaned, invalid, doc_ids, signatures
+
+
+def iter_clean_signed_batches(
+    records: Iterable[Dict],
+    required_fields: List[str],
+    config: Dict,
+    workers: int = 1,
+    batch_size: int = 256,
+) -> Iterator[Tuple[List[Dict], int, List[int], np.ndarray]]:
+    """
+    Validate, normalize and sign streamed documents in one worker pass
+
+    Like ``iter_clean_batches``, but each worker also computes the
+    signatures of its cleaned batch (see ``_iter_signature_batches``), so
+    hashing runs in the pool instead of the parent process.
+
+    Args:
+        records: Parsed JSON documents
+        required_fields: Fields every valid document must contain
+        config: Configuration dictionary
+        workers: Number of worker processes
+        batch_size: Documents per batch sent to a worker
+
+    Yields:
+        Tuples of (cleaned documents, number of invalid documents, indices
+        into the cleaned documents, ``(len(indices), num_perm)`` signatures)
+    """
+    _signature_builder(config)  # fail fast on a bad config
+    tasks = ((batch, required_fields, config) for batch in _batched(records, batch_size))
+    if workers <= 1:
+        yield from map(_clean_and_sign_batch, tasks)
+        return
+    with Pool(processes=workers) as pool:
+        yield from pool.imap(_clean_and_sign_batch, tasks)
+
+
+def _signature_store_layout(config: Dict) -> Optional[str]:
+    """
+    Redis layout for persisted signatures, or ``None`` when not persisted
+
+    Nothing in the pipeline reads signatures back, so they are only written
+    when ``redis.persist_signatures`` is set; ``signature_store`` then picks
+    the layout used by ``_store_signatures``.
+    """
+    if not config.get('redis', {}).get('persist_signatures', False):
+        return None
+    return config.get('signature_store', 'batch')
+
+
+def _store_signatures(
+    redis_client, prefix: str, doc_ids: List[int], signatures: np.ndarray, layout: str = 'batch'
+) -> None:
+    """
+    Write a batch of signatures to Redis in one round trip
+
+    With ``layout='batch'`` the whole batch is stored as a single hash under
+    ``{prefix}:sig_batch:{first_doc_id}`` (see ``load_signature_batch``),
+    which avoids Redis' per-key overhead. With ``layout='per_doc'`` each
+    signature is written to ``{prefix}:sig:{doc_id}`` through a pipeline.
+    Values are raw little-endian bytes of the signature dtype.
+    """
+    if layout not in ('batch', 'per_doc'):
+        raise ValueError(f"Unknown signature_store: {layout}")
+    dtype = signatures.dtype.newbyteorder('<')
+    signatures = signatures.astype(dtype, copy=False)
+    if layout == 'batch':
+        redis_client.hset(
+            f"{prefix}:sig_batch:{doc_ids[0]}",
+            mapping={
+                'ids': np.asarray(doc_ids, dtype='<i8').tobytes(),
+                'dtype': dtype.str,
+                'sigs': np.ascontiguousarray(signatures).tobytes(),
+            },
+        )
+        return
+    pipe = redis_client.pipeline(transaction=False)
+    for doc_id, signature in zip(doc_ids, signatures):
+        pipe.set(f"{prefix}:sig:{doc_id}", signature.tobytes())
+    pipe.execute()
+
+
+def load_signature_batch(redis_client, key: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Read back a signature batch written by ``_store_signatures``
+
+    Args:
+        redis_client: Redis client
+        key: Batch key, ``{prefix}:sig_batch:{first_doc_id}``
+
+    Returns:
+        Tuple of (document ids, signature matrix with one row per id)
+    """
+    fields = redis_client.hgetall(key)
+    if not fields:
+        raise KeyError(key)
+    doc_ids = np.frombuffer(fields[b'ids'], dtype='<i8')
+    signatures = np.frombuffer(fields[b'sigs'], dtype=np.dtype(fields[b'dtype'].decode()))
+    return doc_ids, signatures.reshape(len(doc_ids), -1)
 
 
 def build_minhash_index(documents: List[Dict], config: Dict) -> Tuple[MinHashLSH, Dict[str, MinHash]]:
@@ -177,56 +517,271 @@ def build_minhash_index(documents: List[Dict], config: Dict) -> Tuple[MinHashLSH
     # Configuration
     num_perm = config.get('minhash_permutations', 128)
     threshold = config.get('similarity_threshold', 0.8)
-    ngram_size = config.get('ngram_size', 5)
-    jamo_ngram_size = config.get('jamo_ngram_size', 3)
-
-    redis_cfg = config.get('redis', {})
-    storage_config = {
-        'type': 'redis',
-        'basename': redis_cfg.get('prefix', 'dedup').encode(),
-        'redis': {
-            'host': redis_cfg.get('host', 'localhost'),
-            'port': int(redis_cfg.get('port', 6379)),
-        },
-    }
+    storage_config = _lsh_storage_config(config)
 
     # Initialize LSH backed by Redis
-    lsh = MinHashLSH(threshold=threshold, num_perm=num_perm, storage_config=storage_config)
+    lsh = _new_lsh_index(threshold, num_perm, storage_config)
     minhashes: Dict[str, MinHash] = {}
     redis_client = redis.Redis(
         host=storage_config['redis']['host'],
         port=storage_config['redis']['port'],
     )
+    prefix = storage_config['basename'].decode()
+    store_layout = _signature_store_layout(config)
 
     logger.info(f"Building MinHash LSH index with {num_perm} permutations, threshold={threshold}")
 
-    for doc_id, doc in enumerate(tqdm(documents, desc="Creating MinHashes")):
-        text = preprocess_text(doc.get('text', ''))
+    # Nothing is queried while indexing, so a single buffered session
+    # flushes inserts to Redis in large pipelined chunks
+    with lsh.insertion_session(buffer_size=config.get('lsh_insert_buffer', 10_000)) as session:
+        for doc_ids, signatures in _iter_signature_batches(documents, config):
+            for doc_id, signature in zip(doc_ids, signatures):
+                key = str(doc_id)
+                minhash = OPHMinHash(signature)
+                minhashes[key] = minhash
+                session.insert(key, minhash)
 
-        if len(text.strip()) < 10:  # Skip very short texts
-            continue
+            # Store signatures for later inspection
+            if store_layout:
+                _store_signatures(redis_client, prefix, doc_ids, signatures, store_layout)
 
-        # Create n-grams (word and jamo) and MinHash
-        word_ngrams = tokenize_ngrams(text, ngram_size)
-        jamo_ngrams = tokenize_jamo_ngrams(text, jamo_ngram_size)
-        combined = word_ngrams + jamo_ngrams
-        if len(combined) < 5:
-            continue
+    logger.info(f"Created MinHash index with {len(minhashes)} documents")
+    return lsh, minhashes
 
-        minhash = create_minhash(combined, num_perm)
-        minhashes[str(doc_id)] = minhash
 
-        # Add to LSH index
-        lsh.insert(str(doc_id), minhash)
+def candidate_edges(documents: List[Dict], config: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find candidate near-duplicate pairs as an edge list over document indices
 
-        # Store signature for later inspection
-        redis_client.set(
-            f"{storage_config['basename'].decode()}:sig:{doc_id}",
-            json.dumps(list(minhash.digest())),
-        )
+    Signatures of every indexable document are computed and handed to
+    ``signature_edges``.
 
-    logger.info(f"Created MinHash index with {len(minhashes)} documents")
-    return lsh, minhashes
+    Args:
+        documents: List of document dictionaries
+        config: Configuration dictionary
+
+    Returns:
+        Tuple of ``np.int32`` arrays ``(src, dst)`` of document indices
+    """
+    rows, sigs = _collect_signatures(documents, config)
+    return signature_edges(len(documents), rows, sigs, config)
+
+
+def signature_edges(
+    num_docs: int, rows: np.ndarray, sigs: np.ndarray, config: Dict
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find candidate near-duplicate pairs from a signature matrix
+
+    Chunks smaller than ``dense_cluster_cutoff`` skip LSH: all pairs of
+    b-bit packed signatures are compared directly, which is cheaper than
+    maintaining an index at that size. Larger chunks are banded with NumPy
+    (``lsh_backend: numpy``, default) or indexed in the Redis-backed
+    ``MinHashLSH`` (``lsh_backend: redis``). ``sigs`` may be a ``np.memmap``;
+    banding only reads one band of columns at a time. Edges may repeat and
+    may be self-loops; they are meant for connected components.
+
+    Args:
+        num_docs: Number of documents, indexed or not
+        rows: Document index of every signature row
+        sigs: ``(len(rows), num_perm)`` signature matrix
+        config: Configuration dictionary
+
+    Returns:
+        Tuple of ``np.int32`` arrays ``(src, dst)`` of document indices
+    """
+    backend = config.get('lsh_backend', 'numpy')
+    if backend not in ('numpy', 'redis'):
+        raise ValueError(f"Unknown lsh_backend: {backend}")
+    threshold = config.get('similarity_threshold', 0.8)
+
+    if num_docs < config.get('dense_cluster_cutoff', 2048):
+        bits = config.get('dense_cluster_bits', 8)
+        src, dst = similar_pairs(pack_bbit(sigs, bits), threshold, bits=bits)
+    elif backend == 'numpy':
+        src, dst = lsh_band_pairs(sigs, threshold)
+    else:
+        return _redis_lsh_edges(rows, sigs, config)
+    return rows[src], rows[dst]
+
+
+def index_and_cluster(documents: List[Dict], config: Dict) -> np.ndarray:
+    """
+    Index documents in LSH and group near-duplicates in a single pass
+
+    Every candidate pair from ``candidate_edges`` becomes an edge, and
+    clusters are the connected components of those edges. No MinHash
+    mapping is kept, and no second walk over the index is needed.
+
+    Args:
+        documents: List of document dictionaries
+        config: Configuration dictionary
+
+    Returns:
+        ``np.int64`` array with one cluster label per document
+    """
+    logger = logging.getLogger(__name__)
+
+    src, dst = candidate_edges(documents, config)
+    labels = _connected_component_labels(len(documents), src, dst)
+    logger.info(f"Clustered {len(documents)} documents into {len(np.unique(labels))} groups")
+    return labels
+
+
+def _redis_lsh_edges(rows: np.ndarray, sigs: np.ndarray, config: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find candidate edges through the Redis-backed ``MinHashLSH`` index
+
+    Args:
+        rows: Document index of every signature row
+        sigs: ``(len(rows), num_perm)`` signature matrix
+        config: Configuration dictionary
+
+    Returns:
+        Tuple of ``np.int32`` arrays ``(src, dst)`` of document indices
+    """
+    num_perm = config.get('minhash_permutations', 128)
+    threshold = config.get('similarity_threshold', 0.8)
+    batch_size = config.get('signature_batch_size', 1024)
+    storage_config = _lsh_storage_config(config)
+
+    lsh = _new_lsh_index(threshold, num_perm, storage_config)
+    redis_client = redis.Redis(
+        host=storage_config['redis']['host'],
+        port=storage_config['redis']['port'],
+    )
+    prefix = storage_config['basename'].decode()
+    store_layout = _signature_store_layout(config)
+
+    # Candidate edges between each document and its LSH hits. Each batch is
+    # inserted through a buffered session before it is queried, so a hit may
+    # be the document itself or a later one in the batch; both are harmless
+    # for connected components.
+    src: List[int] = []
+    dst: List[int] = []
+    for start in range(0, len(rows), batch_size):
+        doc_ids = rows[start:start + batch_size].tolist()
+        signatures = np.asarray(sigs[start:start + batch_size])
+        minhashes = [OPHMinHash(signature) for signature in signatures]
+        with lsh.insertion_session(buffer_size=len(doc_ids)) as session:
+            for doc_id, minhash in zip(doc_ids, minhashes):
+                session.insert(str(doc_id), minhash)
+        for doc_id, minhash in zip(doc_ids, minhashes):
+            for hit in lsh.query(minhash):
+                src.append(doc_id)
+                dst.append(int(hit))
+        if store_layout:
+            _store_signatures(redis_client, prefix, doc_ids, signatures, store_layout)
+
+    return np.asarray(src, dtype=np.int32), np.asarray(dst, dtype=np.int32)
+
+
+def _collect_signatures(documents: List[Dict], config: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the signature matrix of every indexable document
+
+    Args:
+        documents: List of document dictionaries
+        config: Configuration dictionary
+
+    Returns:
+        Tuple of (``np.int32`` document indices, signature rows)
+    """
+    doc_ids: List[int] = []
+    batches: List[np.ndarray] = []
+    for batch_ids, signatures in _iter_signature_batches(documents, config):
+        doc_ids.extend(batch_ids)
+        batches.append(signatures)
+
+    num_perm = config.get('minhash_permutations', 128)
+    sigs = np.concatenate(batches) if batches else np.empty((0, num_perm), dtype=np.uint32)
+    return np.asarray(doc_ids, dtype=np.int32), sigs
+
+
+def _connected_component_labels(n: int, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """
+    Label the connected components of an undirected graph given as an edge list
+
+    Uses SciPy's compiled graph search when available, else a union-find.
+
+    Args:
+        n: Number of nodes
+        src: Edge source node indices
+        dst: Edge destination node indices
+
+    Returns:
+        ``np.int64`` component label per node
+    """
+    if connected_components is not None:
+        graph = csr_matrix((np.ones(len(src), dtype=np.int8), (src, dst)), shape=(n, n))
+        _, labels = connected_components(graph, directed=False)
+        return labels.astype(np.int64)
+
+    parent = list(range(n))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for a, b in zip(src.tolist(), dst.tolist()):
+        root_a, root_b = find(a), find(b)
+        if root_a != root_b:
+            parent[root_b] = root_a
+    return np.fromiter((find(i) for i in range(n)), dtype=np.int64, count=n)
+
+
+def clusters_from_labels(labels: np.ndarray) -> List[Set[str]]:
+    """
+    Convert per-document cluster labels into duplicate clusters
+
+    Args:
+        labels: Cluster label per document
+
+    Returns:
+        Document ID sets for every label shared by more than one document
+    """
+    labels = np.asarray(labels)
+    order = np.argsort(labels, kind='stable')
+    _, starts, counts = np.unique(labels[order], return_index=True, return_counts=True)
+    return [
+        {str(doc_id) for doc_id in order[start:start + count]}
+        for start, count in zip(starts, counts)
+        if count > 1
+    ]
+
+
+def drop_exact_duplicates(
+    documents: List[Dict], seen: Optional[Set[int]] = None
+) -> Tuple[List[Dict], int]:
+    """
+    Remove documents whose text exactly matches an earlier document
+
+    A content-hash probe is far cheaper than MinHash + LSH, so this runs
+    before the LSH candidate search to keep exact copies out of it.
+    Records without a string ``text`` are kept for validation to reject.
+
+    Args:
+        documents: Document list
+        seen: Content hashes of earlier documents; updated in place, so
+            batches of a stream can share it
+
+    Returns:
+        Tuple of (documents keeping the first copy of each text, removed count)
+    """
+    if seen is None:
+        seen = set()
+    unique: List[Dict] = []
+    for doc in documents:
+        text = doc.get('text') if isinstance(doc, dict) else None
+        if isinstance(text, str):
+            digest = content_hash(text)
+            if digest in seen:
+                continue
+            seen.add(digest)
+        unique.append(doc)
+    return unique, len(documents) - len(unique)
 
 
 def find_duplicate_clusters(
@@ -235,6 +790,12 @@ def find_duplicate_clusters(
     """
     Find clusters of duplicate documents
 
+    Every LSH bucket holding more than one document is read once, straight
+    from the index's hash tables, instead of querying the index per
+    document. Each bucket member is linked to the bucket's lowest document
+    id, and clusters are the connected components of those links, so they
+    never overlap.
+
     Args:
         lsh: MinHash LSH index
         minhashes: Document ID to MinHash mapping
@@ -244,90 +805,178 @@ def find_duplicate_clusters(
     """
     logger = logging.getLogger(__name__)
 
-    clusters: List[Set[str]] = []
-    processed: Set[str] = set()
-    candidate_pairs: List[Tuple[str, str]] = []
+    doc_ids = list(minhashes)
+    position = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+    prepickled = getattr(lsh, 'prepickle', False)
+
+    src: List[int] = []
+    dst: List[int] = []
+    for table in tqdm(getattr(lsh, 'hashtables', []), desc="Finding duplicates"):
+        shared = [key for key, count in table.itemcounts().items() if count > 1]
+        for bucket in (table.getmany(*shared) if shared else []):
+            keys = [pickle.loads(key) for key in bucket] if prepickled else bucket
+            members = sorted(position[key] for key in keys if key in position)
+            src.extend(members[:1] * (len(members) - 1))
+            dst.extend(members[1:])
+
+    src_arr = np.asarray(src, dtype=np.int32)
+    dst_arr = np.asarray(dst, dtype=np.int32)
+    labels = _connected_component_labels(len(doc_ids), src_arr, dst_arr)
+    clusters = [{doc_ids[int(i)] for i in cluster} for cluster in clusters_from_labels(labels)]
+    candidate_pairs = [(doc_ids[a], doc_ids[b]) for a, b in sorted(set(zip(src, dst)))]
 
-    for doc_id in tqdm(minhashes.keys(), desc="Finding duplicates"):
-        if doc_id in processed:
-            continue
+    logger.info(f"Found {len(clusters)} duplicate clusters")
+    return clusters, candidate_pairs
 
-        # Find similar documents
-        candidates = lsh.query(minhashes[doc_id])
-        for cand in candidates:
-            if cand != doc_id:
-                candidate_pairs.append((doc_id, cand))
 
-        if len(candidates) > 1:  # Found duplicates
-            cluster = set(candidates)
-            clusters.append(cluster)
-            processed.update(cluster)
-        else:
-            processed.add(doc_id)
+def _representative_mask(
+    num_docs: int,
+    duplicate_clusters: List[Set[str]],
+    load: Callable[[np.ndarray], List[Dict]],
+    strategy: str = 'min_index',
+    chunk_size: int = 65536,
+) -> np.ndarray:
+    """
+    Mark the documents kept after choosing one representative per cluster
 
-    logger.info(f"Found {len(clusters)} duplicate clusters")
-    return clusters, candidate_pairs
+    With ``strategy='min_index'`` the representative is the member with the
+    lowest document index and no document is loaded. With
+    ``strategy='longest'`` it is the longest member, as in
+    ``select_representative_document``, ties going to the lowest index;
+    members of all clusters are loaded ``chunk_size`` at a time. Either way
+    the per-cluster choice is a single lexsort over all members, and the
+    result does not depend on set iteration order.
+
+    Args:
+        num_docs: Number of documents
+        duplicate_clusters: List of duplicate document ID clusters
+        load: Returns the documents at the given indices
+        strategy: Representative selection, ``'min_index'`` or ``'longest'``
+        chunk_size: Number of cluster members loaded per ``load`` call
+
+    Returns:
+        Boolean mask, ``True`` for non-duplicates and representatives
+    """
+    if strategy not in ('min_index', 'longest'):
+        raise ValueError(f"Unknown representative_strategy: {strategy}")
+
+    keep = np.ones(num_docs, dtype=bool)
+    sizes = np.fromiter((len(cluster) for cluster in duplicate_clusters), dtype=np.int64,
+                        count=len(duplicate_clusters))
+    members = np.fromiter((int(doc_id) for cluster in duplicate_clusters for doc_id in cluster),
+                          dtype=np.int64, count=int(sizes.sum()))
+    labels = np.repeat(np.arange(len(duplicate_clusters)), sizes)
+    valid = members < num_docs
+    members, labels = members[valid], labels[valid]
+    if not len(members):
+        return keep
+
+    if strategy == 'longest':
+        lengths = np.empty(len(members), dtype=np.int64)
+        for start in range(0, len(members), chunk_size):
+            lengths[start:start + chunk_size] = document_lengths(load(members[start:start + chunk_size]))
+        # Sort by cluster, then longest first, then lowest index
+        order = np.lexsort((members, -lengths, labels))
+    else:
+        order = np.lexsort((members, labels))
+
+    # The head of each cluster's run is its representative
+    sorted_labels = labels[order]
+    heads = order[np.r_[True, sorted_labels[1:] != sorted_labels[:-1]]]
+
+    keep[members] = False
+    keep[members[heads]] = True
+    return keep
+
+
+def _dedup_stats(original_count: int, deduplicated_count: int, num_clusters: int) -> Dict:
+    """Build and log the deduplication statistics"""
+    removed_count = original_count - deduplicated_count
+    stats = {
+        'original_count': original_count,
+        'deduplicated_count': deduplicated_count,
+        'removed_count': removed_count,
+        'duplicate_clusters': num_clusters,
+        'deduplication_rate': removed_count / original_count if original_count else 0
+    }
+
+    logging.getLogger(__name__).info(
+        f"Deduplication complete: {stats['original_count']} → {stats['deduplicated_count']} "
+        f"({stats['deduplication_rate']:.2%} reduction)"
+    )
+    return stats
 
 
-def deduplicate_documents(documents: List[Dict], duplicate_clusters: List[Set[str]]) -> Tuple[List[Dict], Dict]:
+def deduplicate_documents(
+    documents: List[Dict], duplicate_clusters: List[Set[str]], strategy: str = 'min_index'
+) -> Tuple[List[Dict], Dict]:
     """
     Remove duplicates by selecting representative documents from each cluster
 
     Args:
         documents: Original document list
         duplicate_clusters: List of duplicate document ID clusters
+        strategy: Representative selection, ``'min_index'`` or ``'longest'``
 
     Returns:
         Tuple of (deduplicated documents, dedup statistics)
     """
-    logger = logging.getLogger(__name__)
-
-    # Create mapping of doc_id -> cluster_id
-    doc_to_cluster = {}
-    for cluster_id, cluster in enumerate(duplicate_clusters):
-        for doc_id in cluster:
-            doc_to_cluster[doc_id] = cluster_id
-
-    # Select representative from each cluster
-    representatives = set()
-    for cluster in duplicate_clusters:
-        cluster_docs = [documents[int(doc_id)] for doc_id in cluster if int(doc_id) < len(documents)]
-        if cluster_docs:
-            rep_idx = select_representative_document(cluster_docs)
-            # Convert back to original document index
-            original_indices = [int(doc_id) for doc_id in cluster if int(doc_id) < len(documents)]
-            representatives.add(original_indices[rep_idx])
+    keep = _representative_mask(
+        len(documents), duplicate_clusters, lambda members: [documents[idx] for idx in members], strategy
+    )
 
     # Keep non-duplicate documents and representatives
-    deduplicated = []
-    removed_count = 0
+    deduplicated = list(compress(documents, keep))
+    return deduplicated, _dedup_stats(len(documents), len(deduplicated), len(duplicate_clusters))
 
-    for idx, doc in enumerate(documents):
-        doc_id = str(idx)
 
-        if doc_id in doc_to_cluster:
-            # This document is part of a duplicate cluster
-            if idx in representatives:
-                deduplicated.append(doc)
-            else:
-                removed_count += 1
-        else:
-            # Not a duplicate, keep it
-            deduplicated.append(doc)
+def deduplicate_spooled(
+    spool_path: str,
+    line_offsets: np.ndarray,
+    duplicate_clusters: List[Set[str]],
+    output_path: str,
+    strategy: str = 'min_index',
+) -> Dict:
+    """
+    Streaming ``deduplicate_documents`` over a JSONL spool file
 
-    # Calculate statistics
-    stats = {
-        'original_count': len(documents),
-        'deduplicated_count': len(deduplicated),
-        'removed_count': removed_count,
-        'duplicate_clusters': len(duplicate_clusters),
-        'deduplication_rate': removed_count / len(documents) if documents else 0
-    }
+    Only cluster members are parsed, read by seeking to their line offsets
+    (none with the ``'min_index'`` strategy);
+    kept lines are then copied to ``output_path`` byte for byte, so the
+    corpus is never held in memory.
 
-    logger.info(f"Deduplication complete: {stats['original_count']} → {stats['deduplicated_count']} "
-                f"({stats['deduplication_rate']:.2%} reduction)")
+    Args:
+        spool_path: JSONL file with one document per line
+        line_offsets: Byte offset of every line in ``spool_path``
+        duplicate_clusters: List of duplicate document ID (line index) clusters
+        output_path: JSONL file receiving the kept lines
+        strategy: Representative selection, ``'min_index'`` or ``'longest'``
 
-    return deduplicated, stats
+    Returns:
+        Deduplication statistics
+    """
+    with open(spool_path, 'rb') as spool:
+        def load(members: np.ndarray) -> List[Dict]:
+            docs = []
+            for idx in members:
+                spool.seek(int(line_offsets[idx]))
+                docs.append(loads_json(spool.readline()))
+            return docs
+
+        keep = _representative_mask(len(line_offsets), duplicate_clusters, load, strategy)
+
+        spool.seek(0)
+        with open(output_path, 'wb') as out:
+            out.writelines(compress(spool, keep))
+
+    return _dedup_stats(len(line_offsets), int(np.count_nonzero(keep)), len(duplicate_clusters))
+
+
+def _candidate_pairs(src: np.ndarray, dst: np.ndarray) -> List[Tuple[str, str]]:
+    """Distinct ``(lower id, higher id)`` document id pairs of an edge list"""
+    pairs = np.stack((np.minimum(src, dst), np.maximum(src, dst)), axis=1)
+    pairs = np.unique(pairs[pairs[:, 0] != pairs[:, 1]], axis=0)
+    return [(str(a), str(b)) for a, b in pairs.tolist()]
 
 
 def main():
@@ -364,69 +1013,121 @@ def main():
 
         # Validate input file
         logger.info(f"Validating cloud input file: {args.input}")
-        is_valid, total_lines, samples = validate_cloud_jsonl_file(storage_client, args.input)
+        is_valid, sampled_lines, samples = validate_cloud_jsonl_file(storage_client, args.input)
 
         if not is_valid:
             logger.error("Cloud input file validation failed")
             return
 
-        logger.info(f"Cloud input file is valid with {total_lines} documents")
+        logger.info(f"Cloud input file is valid ({sampled_lines} sampled lines parsed)")
 
         # Stream and validate documents line by line
         logger.info("Streaming and validating documents...")
         required_fields = config.get("schema", {}).get("required_columns", ["text"])
-        documents = []
-        valid_lines: list[str] = []
+        processing = config.get("processing", {})
+        num_perm = config.get('minhash_permutations', 128)
+        preview: List[Dict] = []
+        offset_batches: List[np.ndarray] = []
+        row_batches: List[np.ndarray] = []
+        sig_dtype = None
+        position = 0
         valid_count = 0
         invalid_count = 0
-        for doc in storage_client.stream_jsonl(args.input):
-            is_valid, err = validate_json(doc, required_fields)
-            if is_valid:
-                cleaned = normalize_document(doc)
-                documents.append(cleaned)
-                valid_lines.append(json.dumps(cleaned, ensure_ascii=False))
-                valid_count += 1
+        exact_removed = 0
+        seen_texts: Set[int] = set()
+
+        def _unique_records(records: Iterable[Dict]) -> Iterator[Dict]:
+            """Drop exact text copies before the records are cleaned and signed"""
+            nonlocal exact_removed
+            for batch in _batched(records, 1024):
+                unique, removed = drop_exact_duplicates(batch, seen_texts)
+                exact_removed += removed
+                yield from unique
+
+        # Cleaned lines are spooled to a local file and their signatures to
+        # a second one as batches are produced; only line offsets and
+        # signature row ids stay in memory
+        ready_spool = tempfile.NamedTemporaryFile("wb", suffix=".jsonl", delete=False)
+        sig_spool = tempfile.NamedTemporaryFile("wb", suffix=".sig", delete=False)
+        output_spool = tempfile.NamedTemporaryFile("wb", suffix=".jsonl", delete=False)
+        output_spool.close()
+        try:
+            with ready_spool, sig_spool:
+                for cleaned_batch, batch_invalid, doc_ids, signatures in iter_clean_signed_batches(
+                    _unique_records(storage_client.stream_jsonl(args.input)),
+                    required_fields,
+                    config,
+                    workers=max(processing.get("max_workers", 1), config.get('signature_workers', 1)),
+                ):
+                    lines = [dumps_json(doc) + b"\n" for doc in cleaned_batch]
+                    lengths = np.fromiter(map(len, lines), dtype=np.int64, count=len(lines))
+                    offset_batches.append(position + np.cumsum(lengths) - lengths)
+                    position += int(lengths.sum())
+                    ready_spool.writelines(lines)
+
+                    if doc_ids:
+                        row_batches.append(np.asarray(doc_ids, dtype=np.int32) + valid_count)
+                        sig_dtype = signatures.dtype
+                        sig_spool.write(np.ascontiguousarray(signatures).tobytes())
+
+                    preview.extend(cleaned_batch[:5 - len(preview)])
+                    valid_count += len(cleaned_batch)
+                    invalid_count += batch_invalid
+
+            logger.info(
+                "Validation finished: %d valid lines, %d invalid lines, %d exact duplicates dropped",
+                valid_count,
+                invalid_count,
+                exact_removed,
+            )
+
+            # Save cleaned lines to dedup_ready
+            dedup_ready_dir = config.get("paths", {}).get("dedup_ready", "data/dedup_ready/")
+            ready_path = os.path.join(dedup_ready_dir, Path(args.input).name)
+            storage_client.upload_file(ready_spool.name, ready_path)
+
+            # Save preview of first five documents
+            preview_path = os.path.join(dedup_ready_dir, "sample_preview.json")
+            storage_client.write_text_file(
+                preview_path,
+                json.dumps(preview, ensure_ascii=False, indent=2),
+            )
+
+            # Find candidate pairs over the memory-mapped signatures and group
+            # them into duplicate clusters
+            line_offsets = np.concatenate(offset_batches) if offset_batches else np.empty(0, dtype=np.int64)
+            rows = np.concatenate(row_batches) if row_batches else np.empty(0, dtype=np.int32)
+            if len(rows):
+                sigs = np.memmap(sig_spool.name, dtype=sig_dtype, mode='r', shape=(len(rows), num_perm))
             else:
-                invalid_count += 1
-
-        logger.info(
-            "Validation finished: %d valid lines, %d invalid lines",
-            valid_count,
-            invalid_count,
-        )
-
-        # Save cleaned lines to dedup_ready
-        dedup_ready_dir = config.get("paths", {}).get("dedup_ready", "data/dedup_ready/")
-        ready_path = os.path.join(dedup_ready_dir, Path(args.input).name)
-        ready_content = "\n".join(valid_lines)
-        storage_client.write_text_file(ready_path, ready_content)
-
-        # Save preview of first five documents
-        preview_path = os.path.join(dedup_ready_dir, "sample_preview.json")
-        storage_client.write_text_file(
-            preview_path,
-            json.dumps(documents[:5], ensure_ascii=False, indent=2),
-        )
-
-        # Build MinHash index
-        lsh, minhashes = build_minhash_index(documents, config)
-
-        # Find duplicate clusters
-        duplicate_clusters, candidate_pairs = find_duplicate_clusters(lsh, minhashes)
-
-        # Deduplicate
-        deduplicated_docs, stats = deduplicate_documents(documents, duplicate_clusters)
-
-        # Save results to cloud storage
-        logger.info(f"Saving deduplicated results to cloud storage: {args.output}")
-
-        # Create JSONL content
-        jsonl_content = '\n'.join(json.dumps(doc, ensure_ascii=False) for doc in deduplicated_docs)
-
-        # Upload to cloud storage
-        success = storage_client.write_text_file(args.output, jsonl_content)
-        if not success:
-            raise Exception("Failed to save results to cloud storage")
+                sigs = np.empty((0, num_perm), dtype=np.uint32)
+            src, dst = signature_edges(valid_count, rows, sigs, config)
+            del sigs
+            duplicate_clusters = clusters_from_labels(_connected_component_labels(valid_count, src, dst))
+            candidate_pairs = _candidate_pairs(src, dst)
+            logger.info(f"Found {len(duplicate_clusters)} duplicate clusters")
+
+            # Deduplicate by copying kept lines from the spool
+            stats = deduplicate_spooled(
+                ready_spool.name,
+                line_offsets,
+                duplicate_clusters,
+                output_spool.name,
+                config.get('representative_strategy', 'min_index'),
+            )
+            if exact_removed:
+                stats["original_count"] += exact_removed
+                stats["removed_count"] += exact_removed
+                stats["deduplication_rate"] = stats["removed_count"] / stats["original_count"]
+
+            # Save results to cloud storage
+            logger.info(f"Saving deduplicated results to cloud storage: {args.output}")
+            success = storage_client.upload_file(output_spool.name, args.output)
+            if not success:
+                raise Exception("Failed to save results to cloud storage")
+        finally:
+            for spool in (ready_spool, sig_spool, output_spool):
+                os.unlink(spool.name)
 
         # Save candidate pairs
         candidates_json = json.dumps(candidate_pairs, ensure_ascii=False, indent=2)
@@ -449,11 +1150,17 @@ def main():
             'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
             'input_file': args.input,
             'output_file': args.output,
-            'before_count': len(documents),
-            'after_count': len(deduplicated_docs),
+            'before_count': stats['original_count'],
+            'after_count': stats['deduplicated_count'],
             'processing_time': round(processing_time, 2),
         }
 
+        # pandas is only needed for this log, so it is imported here rather
+        # than in every worker that imports the module
+        try:
+            import pandas as pd
+        except Exception:  # pragma: no cover - optional dependency
+            pd = None
         if pd is None:
             logger.warning("pandas is not available; skipping CSV log update")
         else:
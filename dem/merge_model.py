@@ -2,39 +2,99 @@
 
 from __future__ import annotations
 
-from typing import Dict, Iterable, Tuple, List
-from decimal import Decimal
+from typing import Dict, Iterable, Tuple
 import argparse
+import math
+from contextlib import ExitStack
 from pathlib import Path
 
 import torch
 
+try:
+    from safetensors import safe_open
+    from safetensors.torch import load_file, save_file
+except Exception:  # pragma: no cover - optional dependency
+    safe_open = load_file = save_file = None
+
+
+def _can_add_inplace(param, delta) -> bool:
+    """Whether ``delta`` can be added into ``param`` without promotion or broadcasting"""
+    return (
+        isinstance(param, torch.Tensor)
+        and isinstance(delta, torch.Tensor)
+        and param.is_floating_point()
+        and param.dtype == delta.dtype
+        and param.shape == delta.shape
+        and param.device == delta.device
+    )
+
 
 def merge_models(
     base_model: Dict[str, torch.Tensor],
     diffs: Iterable[Tuple[Dict[str, torch.Tensor], float]],
 ) -> Dict[str, torch.Tensor]:
-    """Apply weighted diff vectors to ``base_model`` and return merged params."""
-
-    merged = {
-        name: param.clone() if hasattr(param, "clone") else Decimal(str(param))
-        for name, param in base_model.items()
+    """Apply weighted diff vectors to ``base_model`` and return merged params.
+
+    Floating tensors whose diff has the same dtype and shape are updated in
+    place with one fused ``torch._foreach_add_`` per dtype and diff; other
+    tensors (integer buffers, broadcast or promoted entries) use an
+    out-of-place add. Plain numbers are summed with ``math.fsum`` so the
+    result is the correctly rounded total of all weighted deltas.
+
+    Raises:
+        KeyError: If a diff contains a parameter missing from ``base_model``
+    """
+
+    names = [name for name, param in base_model.items() if isinstance(param, torch.Tensor)]
+    merged = {name: base_model[name].clone() for name in names}
+    scalar_terms = {
+        name: [float(param)] for name, param in base_model.items() if name not in merged
     }
 
     for diff, weight in diffs:
-        for name, delta in diff.items():
-            if isinstance(merged[name], Decimal):
-                merged[name] += Decimal(str(weight * delta))
+        for name in diff:
+            if name not in base_model:
+                raise KeyError(name)
+        groups: Dict[torch.dtype, Tuple[list, list]] = {}
+        for name in names:
+            if name not in diff:
+                continue
+            delta = diff[name]
+            if _can_add_inplace(merged[name], delta):
+                params, deltas = groups.setdefault(delta.dtype, ([], []))
+                params.append(merged[name])
+                deltas.append(delta)
             else:
                 merged[name] = merged[name] + weight * delta
+        for params, deltas in groups.values():
+            torch._foreach_add_(params, deltas, alpha=weight)
+        for name, terms in scalar_terms.items():
+            if name in diff:
+                terms.append(weight * float(diff[name]))
 
     return {
-        name: float(val) if isinstance(val, Decimal) else val for name, val in merged.items()
+        name: merged[name] if name in merged else math.fsum(scalar_terms[name])
+        for name in base_model
     }
 
 
+def _is_safetensors(path: str) -> bool:
+    return Path(path).suffix == ".safetensors"
+
+
+def _require_safetensors() -> None:
+    if safe_open is None:
+        raise ImportError("safetensors is required for .safetensors files")
+
+
 def load_state_dict(path: str) -> Dict[str, torch.Tensor]:
-    """Load a PyTorch state dict from ``path`` on CPU."""
+    """Load a PyTorch state dict from ``path`` on CPU.
+
+    ``.safetensors`` files are memory-mapped instead of unpickled.
+    """
+    if _is_safetensors(path):
+        _require_safetensors()
+        return load_file(path, device="cpu")
     return torch.load(path, map_location="cpu")
 
 
@@ -42,7 +102,57 @@ def save_state_dict(path: str, state_dict: Dict[str, torch.Tensor]) -> None:
     """Save ``state_dict`` to ``path`` creating parent directories."""
     out = Path(path)
     out.parent.mkdir(parents=True, exist_ok=True)
-    torch.save(state_dict, out)
+    if _is_safetensors(path):
+        _require_safetensors()
+        save_file(state_dict, str(out))
+    else:
+        torch.save(state_dict, out)
+
+
+def merge_model_files(
+    base_path: str, diff_specs: Iterable[Tuple[str, float]]
+) -> Dict[str, torch.Tensor]:
+    """Merge weighted diff files into the base model loaded from ``base_path``.
+
+    ``.safetensors`` diffs are opened together with ``safe_open`` and applied
+    parameter by parameter, so at most one diff tensor is resident besides
+    the merged model. Other diff files are loaded whole and go through
+    ``merge_models``. Both paths add with the same dtype rules.
+
+    Raises:
+        KeyError: If a diff contains a parameter missing from the base model
+    """
+    merged = load_state_dict(base_path)
+    safetensors_specs = []
+    for path, weight in diff_specs:
+        if _is_safetensors(path):
+            safetensors_specs.append((path, weight))
+        else:
+            merged = merge_models(merged, [(load_state_dict(path), weight)])
+
+    if not safetensors_specs:
+        return merged
+
+    _require_safetensors()
+    with ExitStack() as stack:
+        diffs = []
+        for path, weight in safetensors_specs:
+            diff_file = stack.enter_context(safe_open(path, framework="pt", device="cpu"))
+            names = set(diff_file.keys())
+            for name in names:
+                if name not in merged:
+                    raise KeyError(name)
+            diffs.append((diff_file, names, weight))
+        for name in list(merged):
+            for diff_file, names, weight in diffs:
+                if name in names:
+                    delta = diff_file.get_tensor(name)
+                    if _can_add_inplace(merged[name], delta):
+                        merged[name].add_(delta, alpha=weight)
+                    else:
+                        merged[name] = merged[name] + weight * delta
+
+    return merged
 
 
 def parse_diff_arg(arg: str) -> tuple[str, float]:
@@ -78,14 +188,7 @@ def main() -> None:  # pragma: no cover - CLI
     )
     args = parser.parse_args()
 
-    base = load_state_dict(args.base_model)
-
-    diffs: List[Tuple[Dict[str, torch.Tensor], float]] = []
-    for d in args.diff:
-        path, weight = parse_diff_arg(d)
-        diffs.append((load_state_dict(path), weight))
-
-    merged = merge_models(base, diffs)
+    merged = merge_model_files(args.base_model, [parse_diff_arg(d) for d in args.diff])
 
     out_path = Path(args.output_dir) / "pytorch_model.bin"
     save_state_dict(str(out_path), merged)
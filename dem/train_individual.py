@@ -8,12 +8,14 @@ from typing import Optional
 import logging
 import yaml
 import pandas as pd
-import json
 import torch
-from torch.utils.data import DataLoader, TensorDataset
-from transformers import AutoModelForCausalLM, AutoTokenizer
+from datasets import Dataset
+from torch.utils.data import DataLoader
+from transformers import AutoModelForCausalLM, AutoTokenizer, DataCollatorForLanguageModeling
 from peft import LoraConfig, get_peft_model
 
+from utils.data_utils import loads_json
+
 logger = logging.getLogger(__name__)
 
 
@@ -59,36 +61,56 @@ def train_individual_domain(
     )
     model = get_peft_model(model, lora_config)
 
+    # Lines are parsed here rather than by load_dataset("json"), which
+    # aborts on the first malformed line; bad lines and rows without a
+    # string text are skipped.
     texts = []
-    with open(data_path, "r", encoding="utf-8") as f:
+    with open(data_path, "rb") as f:
         for line in f:
             try:
-                texts.append(json.loads(line)["text"])
+                text = loads_json(line)["text"]
             except Exception:
                 continue
-
-    enc = tokenizer(
-        texts,
-        padding="max_length",
-        truncation=True,
-        max_length=min(32, tokenizer.model_max_length),
-        return_tensors="pt",
+            if isinstance(text, str):
+                texts.append(text)
+    dataset = Dataset.from_dict({"text": texts})
+    max_length = min(32, tokenizer.model_max_length)
+    dataset = dataset.map(
+        lambda batch: tokenizer(batch["text"], truncation=True, max_length=max_length),
+        batched=True,
+        num_proc=max(1, min(training_cfg.get("num_proc", 1), len(dataset))),
+        remove_columns=dataset.column_names,
     )
-    dataset = TensorDataset(enc.input_ids, enc.attention_mask, enc.input_ids.clone())
-    dataloader = DataLoader(dataset, batch_size=training_cfg.get("batch_size", 1))
+    # Pad each batch to its own longest row; labels mirror input_ids with
+    # padding masked out.
+    collator = DataCollatorForLanguageModeling(tokenizer, mlm=False)
+    dataloader = DataLoader(dataset, batch_size=training_cfg.get("batch_size", 1), collate_fn=collator)
     optimizer = torch.optim.AdamW(model.parameters(), lr=training_cfg.get("learning_rate", 5e-5))
+    logging_steps = max(1, training_cfg.get("logging_steps", 10))
     losses = []
+    pending = []
+    step = 0
 
     model.train()
     for epoch in range(training_cfg.get("max_epochs", 1)):
         for batch in dataloader:
             optimizer.zero_grad()
-            outputs = model(input_ids=batch[0], attention_mask=batch[1], labels=batch[2])
+            outputs = model(**batch)
             loss = outputs.loss
             loss.backward()
             optimizer.step()
-            losses.append(loss.item())
-            logger.info("loss=%f", loss.item())
+            step += 1
+            # Kept on device and read back once every logging_steps steps,
+            # so there is one host sync per interval rather than per step
+            pending.append(loss.detach())
+            if step % logging_steps == 0:
+                losses.extend(torch.stack(pending).tolist())
+                pending = []
+                logger.info("step=%d loss=%f", step, losses[-1])
+
+    if pending:
+        losses.extend(torch.stack(pending).tolist())
+        logger.info("step=%d loss=%f", step, losses[-1])
 
     model.save_pretrained(output_dir)
     adapter_bin = Path(output_dir) / "adapter_model.bin"
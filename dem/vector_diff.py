@@ -11,32 +11,57 @@ from pathlib import Path
 import torch
 import numpy as np
 
+from .merge_model import save_state_dict
+
 
 def compute_vector_diff(
     base_model: Dict[str, torch.Tensor],
     fine_tuned_model: Dict[str, torch.Tensor],
 ) -> Dict[str, torch.Tensor]:
-    """Return ``fine_tuned_model`` parameters minus ``base_model`` parameters."""
-
-    diff: Dict[str, torch.Tensor] = {}
-    for name, base_param in base_model.items():
-        tuned_param = fine_tuned_model[name]
-        diff[name] = tuned_param - base_param
-    return diff
+    """Return ``fine_tuned_model`` parameters minus ``base_model`` parameters.
+
+    Tensors are subtracted with one fused ``torch._foreach_sub`` call; plain
+    numbers are subtracted individually.
+    """
+
+    names = [name for name, param in base_model.items() if isinstance(param, torch.Tensor)]
+    tensor_diffs = dict(zip(
+        names,
+        torch._foreach_sub(
+            [fine_tuned_model[name] for name in names],
+            [base_model[name] for name in names],
+        ) if names else [],
+    ))
+    return {
+        name: tensor_diffs[name] if name in tensor_diffs else fine_tuned_model[name] - base_param
+        for name, base_param in base_model.items()
+    }
 
 
 def compute_stats(diff: Dict[str, torch.Tensor]) -> Dict[str, float]:
-    """Return norm, max and min values of all tensors in ``diff``."""
-
-    if not diff:
+    """Return norm, max and min values of all tensors in ``diff``.
+
+    Reductions run per tensor with ``torch.linalg.vector_norm`` and
+    ``torch.aminmax``, so the diff is never copied to NumPy or concatenated;
+    the partial results are combined on the tensors' device and read back
+    with a single sync. Squared norms are accumulated in float64; integer
+    and bool buffers (e.g. ``num_batches_tracked``) are upcast to float64
+    first, since neither reduction accepts them as they are.
+    """
+
+    tensors = [
+        t.detach() if t.is_floating_point() else t.detach().double()
+        for t in diff.values() if t.numel()
+    ]
+    if not tensors:
         return {"norm": 0.0, "max": 0.0, "min": 0.0}
 
-    arr = np.concatenate([t.detach().cpu().numpy().ravel() for t in diff.values()])
-    return {
-        "norm": float(np.linalg.norm(arr)),
-        "max": float(np.max(arr)),
-        "min": float(np.min(arr)),
-    }
+    norms = torch.stack([torch.linalg.vector_norm(t, dtype=torch.float64) for t in tensors])
+    bounds = [torch.aminmax(t) for t in tensors]
+    minimum = torch.stack([lo.double() for lo, _ in bounds]).min()
+    maximum = torch.stack([hi.double() for _, hi in bounds]).max()
+    norm, maximum, minimum = torch.stack([norms.square().sum().sqrt(), maximum, minimum]).tolist()
+    return {"norm": norm, "max": maximum, "min": minimum}
 
 
 def main() -> None:
@@ -52,6 +77,12 @@ def main() -> None:
     parser.add_argument(
         "--stats-dir", default="diff_stats", help="Directory to save stats JSON"
     )
+    parser.add_argument(
+        "--format",
+        choices=["npy", "safetensors"],
+        default="npy",
+        help="Diff file format; safetensors files can be memory-mapped by merge_model",
+    )
     args = parser.parse_args()
 
     base = torch.load(args.base, map_location="cpu")
@@ -61,8 +92,11 @@ def main() -> None:
 
     diff_dir = Path(args.diff_dir)
     diff_dir.mkdir(parents=True, exist_ok=True)
-    diff_path = diff_dir / f"diff_{args.domain}.npy"
-    np.save(diff_path, {k: v.detach().cpu().numpy() for k, v in diff.items()})
+    diff_path = diff_dir / f"diff_{args.domain}.{args.format}"
+    if args.format == "safetensors":
+        save_state_dict(str(diff_path), {k: v.detach().contiguous().cpu() for k, v in diff.items()})
+    else:
+        np.save(diff_path, {k: v.detach().cpu().numpy() for k, v in diff.items()})
 
     stats = compute_stats(diff)
     stats_dir = Path(args.stats_dir)
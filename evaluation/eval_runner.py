@@ -3,13 +3,21 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Iterable, List
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 
 from evaluation.compute_metrics import compute_metrics
+from utils.data_utils import loads_json
+
+try:  # Optional dependency
+    import torch
+except Exception:  # pragma: no cover - allow import without torch
+    torch = None  # type: ignore
 
 try:  # Optional dependency
     from transformers import AutoModelForCausalLM, AutoTokenizer
@@ -19,25 +27,95 @@ except Exception:  # pragma: no cover - allow import without transformers
 DEFAULT_PROMPT_FILE = "evaluation/eval_prompts.jsonl"
 
 
+def iter_prompts(prompt_file: str = DEFAULT_PROMPT_FILE) -> Iterator[dict]:
+    """Lazily yield prompt entries from a JSONL file, skipping blank lines."""
+    with open(prompt_file, "rb") as file:
+        for line in file:
+            if line.strip():
+                yield loads_json(line)
+
+
 def load_prompts(prompt_file: str = DEFAULT_PROMPT_FILE) -> List[dict]:
     """Load prompts (and optional references) from a JSONL file."""
-    prompts: List[dict] = []
-    with open(prompt_file, "r", encoding="utf-8") as file:
-        for line in file:
-            prompts.append(json.loads(line))
-    return prompts
+    return list(iter_prompts(prompt_file))
+
+
+def generate_responses(
+    model: Any, tokenizer: Any, prompts: Iterable[str], batch_size: int = 16
+) -> List[str]:
+    """Generate responses for the given prompts using a model.
 
+    Prompts are left-padded and generated ``batch_size`` at a time with one
+    ``model.generate`` call per batch.
+    """
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    tokenizer.padding_side = "left"
 
-def generate_responses(model: Any, tokenizer: Any, prompts: Iterable[str]) -> List[str]:
-    """Generate responses for the given prompts using a model."""
+    prompts = list(prompts)
     responses: List[str] = []
-    for prompt in prompts:
-        inputs = tokenizer(prompt, return_tensors="pt")
+    for start in range(0, len(prompts), batch_size):
+        inputs = tokenizer(
+            prompts[start:start + batch_size], return_tensors="pt", padding=True
+        ).to(model.device)
         output_ids = model.generate(**inputs, max_new_tokens=32)
-        responses.append(tokenizer.decode(output_ids[0], skip_special_tokens=True))
+        responses.extend(tokenizer.batch_decode(output_ids, skip_special_tokens=True))
     return responses
 
 
+_TOKENIZER_FILES = ("tokenizer.json", "tokenizer_config.json", "special_tokens_map.json")
+
+
+def _tokenizer_digest(model_path: str) -> str | None:
+    """Hash the tokenizer files of a local model directory.
+
+    Returns ``None`` when ``model_path`` has no ``tokenizer.json`` (e.g. a
+    hub id), in which case tokenizers cannot be compared cheaply.
+    """
+    directory = Path(model_path)
+    if not (directory / "tokenizer.json").is_file():
+        return None
+    digest = hashlib.sha256()
+    for name in _TOKENIZER_FILES:
+        path = directory / name
+        digest.update(name.encode())
+        if path.is_file():
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _load_tokenizers(base_model_path: str, merged_model_path: str) -> Tuple[Any, Any]:
+    """Load the base and merged tokenizers, sharing one when their files match."""
+    base_tokenizer = AutoTokenizer.from_pretrained(base_model_path)
+    base_digest = _tokenizer_digest(base_model_path)
+    if base_digest is not None and base_digest == _tokenizer_digest(merged_model_path):
+        return base_tokenizer, base_tokenizer
+    return base_tokenizer, AutoTokenizer.from_pretrained(merged_model_path)
+
+
+def _generate_pair(
+    base_model: Any, base_tokenizer: Any, merged_model: Any, merged_tokenizer: Any, prompts: List[str]
+) -> Tuple[List[str], List[str]]:
+    """Generate base and merged model responses for ``prompts``.
+
+    With two or more CUDA devices the models are placed on ``cuda:0`` and
+    ``cuda:1`` and generate concurrently from two threads; otherwise they
+    run one after the other.
+    """
+    if torch is None or not torch.cuda.is_available() or torch.cuda.device_count() < 2:
+        return (
+            generate_responses(base_model, base_tokenizer, prompts),
+            generate_responses(merged_model, merged_tokenizer, prompts),
+        )
+
+    base_model.to("cuda:0")
+    merged_model.to("cuda:1")
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        base_future = ex.submit(generate_responses, base_model, base_tokenizer, prompts)
+        merged_future = ex.submit(generate_responses, merged_model, merged_tokenizer, prompts)
+        return base_future.result(), merged_future.result()
+
+
 def save_prompt_comparison(
     base_model_path: str,
     merged_model_path: str,
@@ -51,13 +129,11 @@ def save_prompt_comparison(
     if AutoModelForCausalLM is None or AutoTokenizer is None:
         raise ImportError("transformers is required for running evaluation")
 
-    base_tok = AutoTokenizer.from_pretrained(base_model_path)
+    base_tok, merged_tok = _load_tokenizers(base_model_path, merged_model_path)
     base_model = AutoModelForCausalLM.from_pretrained(base_model_path)
-    merged_tok = AutoTokenizer.from_pretrained(merged_model_path)
     merged_model = AutoModelForCausalLM.from_pretrained(merged_model_path)
 
-    base_outputs = generate_responses(base_model, base_tok, prompts)
-    merged_outputs = generate_responses(merged_model, merged_tok, prompts)
+    base_outputs, merged_outputs = _generate_pair(base_model, base_tok, merged_model, merged_tok, prompts)
 
     out = Path(output_path)
     out.parent.mkdir(parents=True, exist_ok=True)
@@ -89,13 +165,13 @@ def run_evaluation(
             "transformers is required for running evaluation"
         )
 
-    base_tokenizer = AutoTokenizer.from_pretrained(base_model_path)
+    base_tokenizer, merged_tokenizer = _load_tokenizers(base_model_path, merged_model_path)
     base_model = AutoModelForCausalLM.from_pretrained(base_model_path)
-    merged_tokenizer = AutoTokenizer.from_pretrained(merged_model_path)
     merged_model = AutoModelForCausalLM.from_pretrained(merged_model_path)
 
-    base_outputs = generate_responses(base_model, base_tokenizer, prompts)
-    merged_outputs = generate_responses(merged_model, merged_tokenizer, prompts)
+    base_outputs, merged_outputs = _generate_pair(
+        base_model, base_tokenizer, merged_model, merged_tokenizer, prompts
+    )
 
     refs = references if any(references) else base_outputs
 
@@ -3,12 +3,20 @@ Parquet utility functions for schema creation and validation
 """
 
 import logging
-from typing import Dict
+from typing import Dict, Optional
 
 import pyarrow as pa
 import pyarrow.parquet as pq
 
 
+_DEFAULT_TYPE = pa.string()
+_COLUMN_TYPES = {
+    'string': pa.string(),
+    'list[string]': pa.list_(pa.string()),
+    'categorical': pa.string(),  # Store as string, can be converted to categorical later
+}
+
+
 def create_schema(schema_config: Dict) -> pa.Schema:
     """
     Create PyArrow schema from configuration
@@ -22,21 +30,10 @@ def create_schema(schema_config: Dict) -> pa.Schema:
     required_columns = schema_config.get('required_columns', [])
     column_types = schema_config.get('column_types', {})
 
-    fields = []
-
-    for column in required_columns:
-        column_type = column_types.get(column, 'string')
-
-        if column_type == 'string':
-            pa_type = pa.string()
-        elif column_type == 'list[string]':
-            pa_type = pa.list_(pa.string())
-        elif column_type == 'categorical':
-            pa_type = pa.string()  # Store as string, can be converted to categorical later
-        else:
-            pa_type = pa.string()  # Default to string
-
-        fields.append(pa.field(column, pa_type))
+    fields = [
+        pa.field(column, _COLUMN_TYPES.get(column_types.get(column, 'string'), _DEFAULT_TYPE))
+        for column in required_columns
+    ]
 
     return pa.schema(fields)
 
@@ -89,22 +86,26 @@ def get_parquet_info(file_path: str) -> Dict:
     """
     try:
         parquet_file = pq.ParquetFile(file_path)
-        table = parquet_file.read()
+        metadata = parquet_file.metadata
+        schema = parquet_file.schema_arrow
 
         info = {
-            'num_rows': len(table),
-            'num_columns': len(table.columns),
-            'column_names': table.column_names,
-            'schema': str(table.schema),
-            'file_size_bytes': parquet_file.metadata.serialized_size,
-            'num_row_groups': parquet_file.num_row_groups,
+            'num_rows': metadata.num_rows,
+            'num_columns': len(schema),
+            'column_names': schema.names,
+            'schema': str(schema),
+            'file_size_bytes': metadata.serialized_size,
+            'num_row_groups': metadata.num_row_groups,
         }
 
-        # Column statistics
-        for i, column in enumerate(table.columns):
-            col_name = table.column_names[i]
-            info[f'{col_name}_null_count'] = column.null_count
-            info[f'{col_name}_type'] = str(column.type)
+        # Column statistics, from the footer where possible
+        for col_name, col_type in zip(schema.names, schema.types):
+            null_count = _footer_null_count(metadata, col_name)
+            if null_count is None:
+                # Nested column or missing statistics: decode this column only
+                null_count = parquet_file.read(columns=[col_name]).column(0).null_count
+            info[f'{col_name}_null_count'] = null_count
+            info[f'{col_name}_type'] = str(col_type)
 
         return info
 
@@ -113,6 +114,26 @@ def get_parquet_info(file_path: str) -> Dict:
         return {}
 
 
+def _footer_null_count(metadata: pq.FileMetaData, column_name: str) -> Optional[int]:
+    """
+    Sum the footer null counts of a flat column over all row groups
+
+    Returns None when the column is nested or a row group lacks statistics.
+    """
+    paths = [metadata.schema.column(j).path for j in range(metadata.num_columns)]
+    if paths.count(column_name) != 1 or any(path.startswith(column_name + '.') for path in paths):
+        return None
+    j = paths.index(column_name)
+
+    total = 0
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(j).statistics
+        if stats is None or not stats.has_null_count:
+            return None
+        total += stats.null_count
+    return total
+
+
 def optimize_parquet_for_reading(input_file: str, output_file: str, row_group_size: int = 100000):
     """
     Optimize Parquet file for reading performance
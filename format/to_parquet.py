@@ -8,7 +8,7 @@ import json
 import logging
 import os
 import time
-from typing import Dict, List
+from typing import Callable, Dict, Iterator, List, Optional
 
 import psutil
 try:  # pragma: no cover - torch may be unavailable
@@ -25,6 +25,7 @@ except Exception:  # pragma: no cover - fallback stubs
 import argparse
 
 import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 import pyarrow.json as pj
 
@@ -53,6 +54,7 @@ except Exception:  # pragma: no cover - fallback if PyYAML missing
 
 from .parquet_utils import create_schema, validate_parquet_file
 from utils.cloud_storage import get_storage_client
+from utils.data_utils import loads_json
 
 
 def setup_logging():
@@ -110,123 +112,34 @@ def load_jsonl_batch_from_cloud(storage_client, file_path: str, batch_size: int
 def load_jsonl_batch(file_path: str, batch_size: int = 1000, start_line: int = 0) -> List[Dict]:
     """Load a batch of JSONL documents from a local file."""
     docs: List[Dict] = []
-    with open(file_path, "r", encoding="utf-8") as fh:
+    with open(file_path, "rb") as fh:
         for i, line in enumerate(fh):
             if i < start_line:
                 continue
             if len(docs) >= batch_size:
                 break
-            line = line.strip()
-            if not line:
+            if line.isspace():
                 continue
             try:
-                docs.append(json.loads(line))
+                docs.append(loads_json(line))
             except json.JSONDecodeError:
                 continue
     return docs
 
 
-def clean_and_validate_documents(documents: List[Dict], schema_config: Dict) -> List[Dict]:
-    """
-    Clean and validate documents according to schema
-
-    Args:
-        documents: List of document dictionaries
-        schema_config: Schema configuration from config file
-
-    Returns:
-        List of cleaned and validated documents
-    """
-    required_columns = schema_config.get('required_columns', [])
-    column_types = schema_config.get('column_types', {})
-
-    cleaned_docs = []
-
-    for doc in documents:
-        # Check required columns
-        if not all(col in doc for col in required_columns):
-            continue
-
-        # Create cleaned document with only required columns
-        cleaned_doc = {}
-
-        for col in required_columns:
-            value = doc.get(col)
-
-            # Handle missing values
-            if value is None:
-                if column_types.get(col) == 'string':
-                    value = ''
-                elif column_types.get(col) == 'list[string]':
-                    value = []
-                else:
-                    value = ''
-
-            # Type validation and conversion
-            if column_types.get(col) == 'string' and not isinstance(value, str):
-                value = str(value)
-            elif column_types.get(col) == 'list[string]' and not isinstance(value, list):
-                if isinstance(value, str):
-                    value = [value]
-                else:
-                    value = []
-
-            cleaned_doc[col] = value
-
-        # Skip documents with empty text
-        if not cleaned_doc.get('text', '').strip():
-            continue
-
-        cleaned_docs.append(cleaned_doc)
-
-    return cleaned_docs
-
-
-def convert_to_parquet_batch(documents: List[Dict], schema: pa.Schema) -> pa.Table:
-    """
-    Convert a batch of documents to PyArrow Table
-
-    Args:
-        documents: List of document dictionaries
-        schema: PyArrow schema
-
-    Returns:
-        PyArrow Table
-    """
-    if not documents:
-        return pa.table({}, schema=schema)
-
-    # Create arrays for each column
-    arrays = {}
-
-    for field in schema:
-        column_name = field.name
-        values = [doc.get(column_name) for doc in documents]
-
-        if field.type == pa.string():
-            arrays[column_name] = pa.array(values, type=pa.string())
-        elif field.type == pa.list_(pa.string()):
-            arrays[column_name] = pa.array(values, type=pa.list_(pa.string()))
-        else:
-            arrays[column_name] = pa.array(values)
-
-    return pa.table(arrays, schema=schema)
-
-
 class JSONLDataset(Dataset):
     """Dataset for reading JSONL files."""
 
     def __init__(self, path: str, limit: int | None = None) -> None:
         self.data: List[Dict] = []
-        with open(path, "r", encoding="utf-8") as fh:
+        with open(path, "rb") as fh:
             for i, line in enumerate(fh):
                 if limit is not None and i >= limit:
                     break
-                line = line.strip()
-                if not line:
+                if line.isspace():
                     continue
                 try:
-                    self.data.append(json.loads(line))
+                    self.data.append(loads_json(line))
                 except json.JSONDecodeError:
                     continue
 
@@ -253,10 +166,233 @@ class ParquetDataset(Dataset):
         return {col: self.data[col][idx] for col in self.columns}
 
 
-def get_total_lines(file_path: str) -> int:
-    """Get total number of lines in a file"""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return sum(1 for _ in f)
+# Parse blocks sized to a core's L2 cache by default; a block must still
+# hold the longest line, so it grows when Arrow reports a straddling object.
+DEFAULT_BLOCK_SIZE_KB = 256
+DEFAULT_ROW_GROUP_SIZE = 65536
+_MAX_JSON_BLOCK_SIZE = 1 << 30
+
+
+def clean_and_validate_table(batch: pa.RecordBatch, schema: pa.Schema) -> pa.RecordBatch:
+    """
+    Clean and validate a parsed record batch according to schema
+
+    Rows with a null in any schema column are dropped (Arrow's reader
+    yields null for both missing and null fields), columns are cast to the
+    schema types and rows with blank text are dropped, all with Arrow
+    compute kernels.
+
+    Args:
+        batch: Record batch parsed from JSONL
+        schema: PyArrow schema from ``create_schema``
+
+    Returns:
+        Cleaned record batch with exactly the schema's columns
+    """
+    # Skip documents missing a required column
+    present = None
+    for name in schema.names:
+        column = batch.column(name)
+        if column.null_count:
+            valid = pc.is_valid(column)
+            present = valid if present is None else pc.and_(present, valid)
+    if present is not None:
+        batch = batch.filter(present)
+
+    columns = []
+    for field in schema:
+        column = batch.column(field.name)
+        if column.type != field.type:
+            column = pc.cast(column, field.type, safe=False)
+        columns.append(column)
+    batch = pa.RecordBatch.from_arrays(columns, schema=schema)
+
+    # Skip documents with empty text
+    if 'text' in schema.names:
+        keep = pc.greater(pc.utf8_length(pc.utf8_trim_whitespace(batch.column('text'))), 0)
+        if not pc.all(keep).as_py():
+            batch = batch.filter(keep)
+    return batch
+
+
+def _leaf_paths(name: str, type_: pa.DataType) -> List[str]:
+    """Parquet leaf column paths that an Arrow field of ``type_`` is written as"""
+    if pa.types.is_list(type_) or pa.types.is_large_list(type_):
+        return _leaf_paths(f"{name}.list.element", type_.value_type)
+    if pa.types.is_struct(type_):
+        return [path for child in type_ for path in _leaf_paths(f"{name}.{child.name}", child.type)]
+    return [name]
+
+
+def _column_compression(
+    schema: pa.Schema,
+    compression: str,
+    column_compression: Dict[str, str],
+    compression_level: Dict[str, int],
+) -> tuple:
+    """
+    Expand per-column codec settings to the writer's leaf column paths
+
+    ``ParquetWriter`` matches a compression dict against leaf paths (a list
+    column ``tokens`` is written as ``tokens.list.element``) and leaves any
+    unmatched column uncompressed, so every leaf gets an explicit codec.
+
+    Args:
+        schema: PyArrow schema being written
+        compression: Codec for columns without an override
+        column_compression: Codec per top-level column name
+        compression_level: Level per top-level column name; others use
+            the codec's default level
+
+    Returns:
+        Tuple of (codec per leaf path, level per leaf path or None)
+    """
+    codecs = {}
+    levels = {}
+    for field in schema:
+        for path in _leaf_paths(field.name, field.type):
+            codecs[path] = column_compression.get(field.name, compression)
+            if field.name in compression_level:
+                levels[path] = compression_level[field.name]
+    return codecs, levels or None
+
+
+def _iter_arrow_batches(
+    input_file: str,
+    schema: pa.Schema,
+    block_size: int,
+    progress: Callable[[int], None],
+) -> Iterator[pa.RecordBatch]:
+    """Parse ``input_file`` with Arrow's threaded JSON reader in ``block_size`` blocks"""
+    read_opts = pj.ReadOptions(use_threads=True, block_size=block_size)
+    parse_opts = pj.ParseOptions(explicit_schema=schema, unexpected_field_behavior="ignore")
+
+    # Progress is reported in bytes consumed from the source file, so no
+    # separate pass is needed to count lines up front
+    with pa.OSFile(input_file) as source, pj.open_json(
+        source,
+        read_options=read_opts,
+        parse_options=parse_opts,
+    ) as reader:
+        bytes_done = 0
+        for record_batch in reader:
+            position = source.tell()
+            progress(position - bytes_done)
+            bytes_done = position
+            yield record_batch
+
+
+def _coerce_document(doc: Dict, schema: pa.Schema) -> Dict:
+    """
+    Coerce a parsed document to the schema's column types
+
+    Non-string values in string columns are converted with ``str``; in list
+    columns a bare string becomes a one-element list, list items are
+    converted to strings and any other value becomes an empty list. Missing
+    and null fields stay ``None``.
+    """
+    row = {}
+    for field in schema:
+        value = doc.get(field.name)
+        if value is not None:
+            if pa.types.is_list(field.type):
+                if isinstance(value, str):
+                    value = [value]
+                elif isinstance(value, list):
+                    value = [v if v is None or isinstance(v, str) else str(v) for v in value]
+                else:
+                    value = []
+            elif pa.types.is_string(field.type) and not isinstance(value, str):
+                value = str(value)
+        row[field.name] = value
+    return row
+
+
+def _iter_line_batches(
+    input_file: str,
+    schema: pa.Schema,
+    batch_size: int,
+    progress: Callable[[int], None],
+) -> Iterator[pa.RecordBatch]:
+    """Parse ``input_file`` line by line, skipping lines that are not JSON objects
+
+    Values that do not match the schema type are coerced with
+    ``_coerce_document`` instead of failing the batch.
+    """
+    logger = logging.getLogger(__name__)
+    skipped = 0
+    rows: List[Dict] = []
+    with open(input_file, 'rb') as f:
+        for line_number, line in enumerate(f, 1):
+            progress(len(line))
+            if line.isspace():
+                continue
+            try:
+                doc = loads_json(line)
+            except ValueError:
+                doc = None
+            if not isinstance(doc, dict):
+                skipped += 1
+                logger.debug(f"Skipping malformed line {line_number} in {input_file}")
+                continue
+            rows.append(_coerce_document(doc, schema))
+            if len(rows) >= batch_size:
+                yield pa.RecordBatch.from_pylist(rows, schema=schema)
+                rows = []
+    if rows:
+        yield pa.RecordBatch.from_pylist(rows, schema=schema)
+    if skipped:
+        logger.warning(f"Skipped {skipped} malformed lines in {input_file}")
+
+
+def _write_parquet(
+    input_file: str,
+    output_file: str,
+    schema: pa.Schema,
+    compression: Dict[str, str],
+    compression_level: Optional[Dict[str, int]],
+    block_size: Optional[int],
+    row_group_size: int,
+    batch_size: int = 1000,
+) -> None:
+    """
+    Parse ``input_file`` and write cleaned rows in row groups of ``row_group_size`` rows
+
+    With a ``block_size`` the file is parsed by Arrow in blocks of that many
+    bytes; with ``None`` it is parsed line by line in ``batch_size`` batches.
+    """
+    with pq.ParquetWriter(
+        output_file,
+        schema,
+        compression=compression,
+        compression_level=compression_level,
+        data_page_size=1 << 20,
+        write_batch_size=8192,
+    ) as writer, tqdm(
+        total=os.path.getsize(input_file), unit="B", unit_scale=True, desc="Converting"
+    ) as pbar:
+        if block_size is None:
+            batches = _iter_line_batches(input_file, schema, batch_size, pbar.update)
+        else:
+            batches = _iter_arrow_batches(input_file, schema, block_size, pbar.update)
+        # Every write call starts a new row group, so small parsed blocks are
+        # buffered until a full row group is available
+        pending: List[pa.RecordBatch] = []
+        pending_rows = 0
+        for record_batch in batches:
+            record_batch = clean_and_validate_table(record_batch, schema)
+            if not record_batch.num_rows:
+                continue
+            pending.append(record_batch)
+            pending_rows += record_batch.num_rows
+            if pending_rows >= row_group_size:
+                table = pa.Table.from_batches(pending, schema=schema)
+                full_rows = pending_rows - pending_rows % row_group_size
+                writer.write_table(table.slice(0, full_rows), row_group_size=row_group_size)
+                pending = table.slice(full_rows).to_batches()
+                pending_rows -= full_rows
+        if pending_rows:
+            writer.write_table(pa.Table.from_batches(pending, schema=schema), row_group_size=row_group_size)
 
 
 def convert_jsonl_to_parquet(
@@ -265,16 +401,33 @@ def convert_jsonl_to_parquet(
     config: Dict,
     batch_size: int = 1000,
     compression: str = "brotli",
+    block_size_kb: int = DEFAULT_BLOCK_SIZE_KB,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    compression_level: Optional[int] = None,
 ) -> None:
     """
     Convert JSONL file to Parquet format
-    using a cloud storage client for reading
+
+    The file is parsed with ``pyarrow.json.open_json`` against the configured
+    schema in cache-sized blocks and written in fixed-size row groups. If
+    Arrow rejects the file (a malformed line, or a value of the wrong type),
+    it is parsed again line by line: lines that are not JSON objects are
+    skipped and counted, and mistyped values are coerced.
+    Per-column codecs and levels from the ``parquet`` config section
+    (``column_compression`` / ``compression_level``) override
+    ``compression`` and ``compression_level`` for the named columns.
 
     Args:
         input_file: Path to input JSONL file
         output_file: Path to output Parquet file
         config: Configuration dictionary
-        batch_size: Batch size for processing
+        batch_size: Documents per batch when a file that Arrow cannot parse
+            is converted line by line
+        compression: Parquet compression codec for columns without an override
+        block_size_kb: JSON parse block size in KiB; doubled automatically
+            while a single line does not fit
+        row_group_size: Rows per Parquet row group
+        compression_level: Codec level for columns without an override
     """
     logger = logging.getLogger(__name__)
 
@@ -285,35 +438,39 @@ def convert_jsonl_to_parquet(
     schema = create_schema(schema_config)
     logger.info(f"Created schema: {schema}")
 
-    # Prepare reader and writer
-    block_size = max(batch_size, 1) * 1024
-    read_opts = pj.ReadOptions(block_size=block_size)
-    parse_opts = pj.ParseOptions(explicit_schema=schema)
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
-    # Column-level compression: text with Brotli, tokens with Zstd
-    compression_map = {"text": "brotli", "tokens": "zstd"}
-    writer = pq.ParquetWriter(output_file, schema, compression=compression_map)
-
-    with tqdm(total=total_lines, desc="Converting to Parquet") as pbar:
-        while processed_lines < total_lines:
-            # Load batch
-            documents = load_jsonl_batch(
-                input_file, batch_size, processed_lines)
-
-            if not documents:
-                break
-
-    with pj.open_json(
-        input_file,
-        read_options=read_opts,
-        parse_options=parse_opts,
-    ) as reader, pq.ParquetWriter(
-        output_file,
+    parquet_config = config.get('parquet', {})
+    column_levels = parquet_config.get('compression_level', {})
+    if compression_level is not None:
+        column_levels = {
+            name: column_levels.get(name, compression_level) for name in schema.names
+        }
+    codecs, levels = _column_compression(
         schema,
-        compression=compression,
-    ) as writer:
-        for record_batch in reader:
-            writer.write_batch(record_batch)
+        compression,
+        parquet_config.get('column_compression', {}),
+        column_levels,
+    )
+
+    # Stream JSONL blocks through Arrow's threaded C++ parser straight into
+    # the Parquet writer; no Python dicts are built. Arrow rejects a whole
+    # file over one malformed or mistyped line, so such files are converted
+    # again with the line-by-line parser, which skips or coerces bad lines.
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    block_size = max(block_size_kb, 1) * 1024
+    while True:
+        try:
+            _write_parquet(input_file, output_file, schema, codecs, levels, block_size, row_group_size)
+            break
+        except pa.ArrowInvalid as e:
+            if "straddl" in str(e) and block_size < _MAX_JSON_BLOCK_SIZE:
+                block_size *= 2
+                logger.warning(f"A JSONL line exceeds the parse block; retrying with block_size={block_size}")
+                continue
+            logger.warning(f"Arrow could not parse {input_file} ({e}); falling back to line-by-line parsing")
+            _write_parquet(
+                input_file, output_file, schema, codecs, levels, None, row_group_size, batch_size
+            )
+            break
 
     logger.info(f"Saved Parquet file: {output_file}")
 
@@ -357,14 +514,13 @@ def benchmark_loading_speed(jsonl_file: str, parquet_file: str, batch_size: int
         start_time = time.time()
 
         documents = []
-        with open(jsonl_file, 'r', encoding='utf-8') as f:
+        with open(jsonl_file, 'rb') as f:
             for i, line in enumerate(f):
                 if i >= batch_size:
                     break
-                line = line.strip()
-                if line:
+                if not line.isspace():
                     try:
-                        doc = json.loads(line)
+                        doc = loads_json(line)
                         documents.append(doc)
                     except json.JSONDecodeError:
                         continue
@@ -492,6 +648,12 @@ def main():
         default="brotli",
         help="Compression codec",
     )
+    parser.add_argument("--compression-level", type=int, default=None,
+                        help="Compression level for columns without a configured level")
+    parser.add_argument("--block-size-kb", type=int, default=DEFAULT_BLOCK_SIZE_KB,
+                        help="JSON parse block size in KiB")
+    parser.add_argument("--row-group-size", type=int, default=DEFAULT_ROW_GROUP_SIZE,
+                        help="Rows per Parquet row group")
     parser.add_argument("--benchmark", action="store_true",
                         help="Run loading speed benchmark")
 
@@ -517,6 +679,9 @@ def main():
             config,
             args.batch_size,
             compression=args.compression,
+            block_size_kb=args.block_size_kb,
+            row_group_size=args.row_group_size,
+            compression_level=args.compression_level,
         )
 
         # Run benchmark if requested
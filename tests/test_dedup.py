@@ -4,6 +4,7 @@ Unit tests for deduplication module
 
 import json
 import tempfile
+import numpy as np
 import pytest
 pytest.importorskip("datasketch")
 from unittest.mock import patch, MagicMock
@@ -12,10 +13,37 @@ from dedup.minhash_utils import (
     tokenize_ngrams,
     tokenize_jamo_ngrams,
     create_minhash,
+    create_minhash_compat,
+    create_minhash_oph,
+    create_minhash_oph_batch,
+    create_minhash_oph_batch_from_hashes,
+    create_minhash_perm_batch,
+    create_minhash_perm_batch_from_hashes,
+    create_minhash_perm_batch_gpu,
+    hash_ngrams,
+    jamo_ngram_hashes,
+    word_ngram_hashes,
     jaccard_similarity,
     estimate_jaccard_similarity,
+    batch_jaccard,
+    pack_bbit,
+    similar_pairs,
+    lsh_band_pairs,
+    optimal_lsh_params,
+)
+from dedup.slimpajama_dedup import (
+    build_minhash_index,
+    candidate_edges,
+    clusters_from_labels,
+    deduplicate_documents,
+    deduplicate_spooled,
+    drop_exact_duplicates,
+    find_duplicate_clusters,
+    index_and_cluster,
+    iter_clean_batches,
+    load_signature_batch,
+    validate_cloud_jsonl_file,
 )
-from dedup.slimpajama_dedup import build_minhash_index
 from dedup.cluster_reduction import select_representative_document, _calculate_quality_score
 
 
@@ -39,12 +67,24 @@ class TestMinHashUtils:
         assert len(ngrams) == 1
         assert ngrams[0] == "안녕 하세요"
 
+    def test_tokenize_ngrams_lowercases_mixed_text(self):
+        """Mixed-case text is lowercased before windowing"""
+        ngrams = tokenize_ngrams("Hello 세계 WORLD test", n=2)
+
+        assert ngrams == ["hello 세계", "세계 world", "world test"]
+
     def test_tokenize_jamo_ngrams(self):
         """Tokenize jamo trigrams"""
         text = "가나다"
         jamos = tokenize_jamo_ngrams(text, n=3)
         assert jamos[0] != ""
 
+    def test_tokenize_jamo_ngrams_decomposes_syllables(self):
+        """Syllables split into lead/vowel/tail jamo; other characters pass through"""
+        jamos = tokenize_jamo_ngrams("각a가", n=1)
+
+        assert jamos == ["\u1100", "\u1161", "\u11a8", "a", "\u1100", "\u1161"]
+
     def test_create_minhash(self):
         """Test MinHash creation"""
         ngrams = ["hello world", "world test", "test case"]
@@ -53,6 +93,116 @@ class TestMinHashUtils:
         assert minhash is not None
         assert len(minhash.digest()) == 64
 
+    def test_create_minhash_matches_compat(self):
+        """Batched MinHash updates give the same digest as per-ngram updates"""
+        ngrams = tokenize_ngrams("하나 둘 셋 넷 다섯 여섯 일곱 여덟", n=3)
+        batched = create_minhash(ngrams, num_perm=32)
+        reference = create_minhash_compat(ngrams, num_perm=32)
+
+        assert list(batched.digest()) == list(reference.digest())
+
+    def test_create_minhash_oph(self):
+        """OPH signatures are dense uint64 arrays"""
+        ngrams = ["hello world", "world test", "test case"]
+        sig = create_minhash_oph(ngrams, num_perm=64)
+
+        assert sig.dtype == np.uint64
+        assert sig.shape == (64,)
+        assert not np.any(sig == np.iinfo(np.uint64).max)
+        assert np.array_equal(sig, create_minhash_oph(list(ngrams), num_perm=64))
+
+    def test_create_minhash_oph_batch_matches_single(self):
+        """Batched OPH rows equal per-document signatures"""
+        ngram_lists = [["a b", "b c", "c d"], ["x"], [f"w{i}" for i in range(300)]]
+        sigs = create_minhash_oph_batch(ngram_lists, num_perm=32)
+
+        assert sigs.shape == (3, 32)
+        for row, ngrams in zip(sigs, ngram_lists):
+            assert np.array_equal(row, create_minhash_oph(ngrams, num_perm=32))
+
+    def test_jamo_ngram_hashes_follow_ngram_identity(self):
+        """One hash per jamo n-gram; equal n-grams hash equally, distinct ones differ"""
+        for text, n in [("한국어 텍스트 한국어", 3), ("ab\x00c", 2), ("가", 3), ("", 3), ("한국어 문장", 4)]:
+            ngrams = tokenize_jamo_ngrams(text, n)
+            hashes = jamo_ngram_hashes(text, n)
+            assert len(hashes) == len(ngrams)
+            by_ngram = dict(zip(ngrams, hashes.tolist()))
+            assert len(set(by_ngram.values())) == len(by_ngram)
+            assert [by_ngram[ngram] for ngram in ngrams] == hashes.tolist()
+
+    def test_word_ngram_hashes_follow_ngram_identity(self):
+        """One hash per word n-gram; equal n-grams hash equally, distinct ones differ"""
+        cases = [("A b c a B c a b d", 3), ("하나 둘 셋 넷입니다", 5), ("짧은 글", 5), ("", 2), ("x y x y", 1)]
+        for text, n in cases:
+            ngrams = tokenize_ngrams(text, n)
+            hashes = word_ngram_hashes(text, n)
+            assert len(hashes) == len(ngrams)
+            by_ngram = dict(zip(ngrams, hashes.tolist()))
+            assert len(set(by_ngram.values())) == len(by_ngram)
+            assert [by_ngram[ngram] for ngram in ngrams] == hashes.tolist()
+
+    def test_batch_from_hashes_matches_string_batch(self):
+        """Hash-array builders equal the n-gram string builders"""
+        ngram_lists = [["a b", "b c", "c d"], [], [f"w{i}" for i in range(300)]]
+        hash_arrays = [hash_ngrams(ngrams) for ngrams in ngram_lists]
+
+        assert np.array_equal(
+            create_minhash_perm_batch_from_hashes(hash_arrays, num_perm=32),
+            create_minhash_perm_batch(ngram_lists, num_perm=32),
+        )
+        non_empty = [ngram_lists[0], ngram_lists[2]]
+        assert np.array_equal(
+            create_minhash_oph_batch_from_hashes([hash_ngrams(n) for n in non_empty], num_perm=32),
+            create_minhash_oph_batch(non_empty, num_perm=32),
+        )
+
+    def test_create_minhash_perm_batch_ignores_repeated_ngrams(self):
+        """Repeating n-grams within a document does not change its signature"""
+        ngrams = [f"w{i}" for i in range(50)]
+        sigs = create_minhash_perm_batch([ngrams * 3 + ngrams[:7], [], ngrams], num_perm=64)
+
+        assert np.array_equal(sigs[0], sigs[2])
+        assert np.all(sigs[1] == np.iinfo(np.uint32).max)
+
+    def test_create_minhash_perm_batch_gpu_matches_cpu(self):
+        """The CUDA kernel produces the NumPy permutation signatures"""
+        cupy = pytest.importorskip("cupy")
+        try:
+            has_device = cupy.cuda.runtime.getDeviceCount() > 0
+        except Exception:
+            has_device = False
+        if not has_device:
+            pytest.skip("no CUDA device")
+        hash_arrays = [hash_ngrams(ngrams) for ngrams in (["a b", "b c"], [], [f"w{i}" for i in range(500)])]
+
+        assert np.array_equal(
+            create_minhash_perm_batch_gpu(hash_arrays, num_perm=64),
+            create_minhash_perm_batch_from_hashes(hash_arrays, num_perm=64),
+        )
+
+    def test_create_minhash_perm_batch_estimates_jaccard(self):
+        """Vectorized permutation MinHash is block-size independent and accurate"""
+        set1 = {f"token{i}" for i in range(0, 600)}
+        set2 = {f"token{i}" for i in range(200, 800)}
+        ngram_lists = [sorted(set1), [], sorted(set2)]
+        sigs = create_minhash_perm_batch(ngram_lists, num_perm=128)
+
+        assert np.array_equal(sigs, create_minhash_perm_batch(ngram_lists, num_perm=128, block_size=64))
+        assert sigs.dtype == np.uint32
+        assert np.all(sigs[1] == np.iinfo(np.uint32).max)
+        estimate = estimate_jaccard_similarity(sigs[0], sigs[2])
+        assert abs(estimate - jaccard_similarity(set1, set2)) < 0.15
+
+    def test_create_minhash_oph_estimates_jaccard(self):
+        """OPH similarity should approximate the true Jaccard score"""
+        set1 = {f"token{i}" for i in range(0, 600)}
+        set2 = {f"token{i}" for i in range(200, 800)}
+        sig1 = create_minhash_oph(sorted(set1), num_perm=128)
+        sig2 = create_minhash_oph(sorted(set2), num_perm=128)
+
+        estimate = estimate_jaccard_similarity(sig1, sig2)
+        assert abs(estimate - jaccard_similarity(set1, set2)) < 0.15
+
     def test_jaccard_similarity(self):
         """Test Jaccard similarity calculation"""
         set1 = {"a", "b", "c"}
@@ -93,6 +243,67 @@ class TestMinHashUtils:
         similarity = estimate_jaccard_similarity(mh1, mh2)
         assert abs(similarity - 0.5) < 0.001
 
+    def test_batch_jaccard_matches_pairwise(self):
+        """Batched similarities agree with the two-argument estimate."""
+        sigs = np.array(
+            [[1, 2, 3, 4], [1, 2, 5, 6], [7, 8, 9, 10]],
+            dtype=np.uint64,
+        )
+        sims = batch_jaccard(sigs, block_size=2)
+
+        assert sims.shape == (3, 3)
+        for i in range(3):
+            for j in range(3):
+                assert sims[i, j] == pytest.approx(estimate_jaccard_similarity(sigs[i], sigs[j]))
+
+    def test_pack_bbit_jaccard_tracks_full_signatures(self):
+        """8-bit packed signatures give nearly the same similarities"""
+        sets = [{f"t{i}" for i in range(lo, lo + 400)} for lo in (0, 100, 300, 1000)]
+        sigs = create_minhash_oph_batch([sorted(s) for s in sets], num_perm=256)
+        packed = pack_bbit(sigs, b=8)
+
+        assert packed.dtype == np.uint8
+        full = batch_jaccard(sigs)
+        assert np.allclose(batch_jaccard(packed, bits=8), full, atol=0.05)
+
+    def test_similar_pairs_matches_batch_jaccard(self):
+        """Thresholded tiles give the upper-triangle pairs of the full matrix"""
+        rng = np.random.default_rng(0)
+        sigs = rng.integers(0, 4, size=(50, 16)).astype(np.uint64)
+        src, dst = similar_pairs(sigs, 0.5, block_size=16)
+
+        expected = np.argwhere(np.triu(batch_jaccard(sigs) >= 0.5, 1))
+        assert sorted(zip(src.tolist(), dst.tolist())) == sorted(map(tuple, expected.tolist()))
+
+    def test_optimal_lsh_params_matches_datasketch(self):
+        """Banding parameters agree with datasketch's optimizer"""
+        from datasketch.lsh import _optimal_param
+
+        for threshold in (0.5, 0.8, 0.9):
+            assert optimal_lsh_params(threshold, 128) == _optimal_param(threshold, 128, 0.5, 0.5)
+
+    def test_lsh_band_pairs_links_rows_sharing_a_band(self):
+        """Rows that agree on any full band end up connected"""
+        sigs = np.array(
+            [[1, 2, 3, 4], [1, 2, 9, 9], [7, 7, 3, 4], [5, 6, 8, 0]],
+            dtype=np.uint64,
+        )
+        src, dst = lsh_band_pairs(sigs, 0.5, params=(2, 2))
+
+        assert sorted(zip(src.tolist(), dst.tolist())) == [(0, 1), (0, 2)]
+
+    def test_lsh_band_pairs_ignores_band_key_collisions(self):
+        """Rows whose band keys collide are only linked if the band values match"""
+        sigs = np.array(
+            [[1, 2, 3, 4], [1, 2, 9, 9], [7, 7, 3, 4], [5, 6, 8, 0]],
+            dtype=np.uint64,
+        )
+        collide = lambda block: np.zeros(len(block), dtype=np.uint64)
+        with patch("dedup.minhash_utils._band_keys", side_effect=collide):
+            src, dst = lsh_band_pairs(sigs, 0.5, params=(2, 2))
+
+        assert sorted(zip(src.tolist(), dst.tolist())) == [(0, 1), (0, 2)]
+
     def test_build_minhash_index_with_redis(self):
         """Ensure MinHash signatures stored in Redis"""
         fakeredis = pytest.importorskip("fakeredis")
@@ -110,6 +321,250 @@ class TestMinHashUtils:
             lsh, sigs = build_minhash_index(docs, config)
         assert isinstance(sigs, dict)
 
+    def test_build_minhash_index_clusters_duplicates(self):
+        """Identical long documents end up in the same LSH cluster"""
+        fakeredis = pytest.importorskip("fakeredis")
+        r = fakeredis.FakeRedis()
+        config = {"redis": {"host": "localhost", "port": 6379, "prefix": "dup", "persist_signatures": True}}
+        text = "오늘은 날씨가 맑고 바람이 조금 불어서 산책하기 좋은 하루입니다"
+        docs = [
+            {"text": text},
+            {"text": text},
+            {"text": "전혀 다른 내용의 문서로 경제 뉴스와 주식 시장 동향을 다룹니다"},
+        ]
+        with patch("redis.Redis", return_value=r), patch("redis.StrictRedis", return_value=r):
+            lsh, sigs = build_minhash_index(docs, config)
+            clusters, pairs = find_duplicate_clusters(lsh, sigs)
+
+        assert set(sigs) == {"0", "1", "2"}
+        assert clusters == [{"0", "1"}]
+        doc_ids, stored = load_signature_batch(r, "dup:sig_batch:0")
+        assert doc_ids.tolist() == [0, 1, 2]
+        assert stored.dtype == np.dtype("<u4")
+        assert np.array_equal(stored[2], sigs["2"].digest())
+        assert ("0", "1") in pairs
+        assert {len(key) for key in lsh.hashtables[0].keys()} == {8}
+
+    def test_build_minhash_index_per_doc_signature_store(self):
+        """The per-document layout writes one raw signature per key"""
+        fakeredis = pytest.importorskip("fakeredis")
+        r = fakeredis.FakeRedis()
+        config = {
+            "redis": {"host": "localhost", "port": 6379, "prefix": "dup", "persist_signatures": True},
+            "signature_store": "per_doc",
+        }
+        docs = [{"text": "오늘은 날씨가 맑고 바람이 조금 불어서 산책하기 좋은 하루입니다"}]
+        with patch("redis.Redis", return_value=r), patch("redis.StrictRedis", return_value=r):
+            _, sigs = build_minhash_index(docs, config)
+
+        stored = np.frombuffer(r.get("dup:sig:0"), dtype="<u4")
+        assert np.array_equal(stored, sigs["0"].digest())
+        assert not r.exists("dup:sig_batch:0")
+
+    def test_build_minhash_index_skips_signatures_by_default(self):
+        """Signatures are only written to Redis when persist_signatures is set"""
+        fakeredis = pytest.importorskip("fakeredis")
+        r = fakeredis.FakeRedis()
+        config = {"redis": {"host": "localhost", "port": 6379, "prefix": "dup"}}
+        docs = [{"text": "오늘은 날씨가 맑고 바람이 조금 불어서 산책하기 좋은 하루입니다"}]
+        with patch("redis.Redis", return_value=r), patch("redis.StrictRedis", return_value=r):
+            build_minhash_index(docs, config)
+
+        assert not r.keys("dup:sig*")
+
+    def test_candidate_edges_link_near_duplicates(self):
+        """Both in-memory backends link the copies and nothing else"""
+        text = "오늘은 날씨가 맑고 바람이 조금 불어서 산책하기 좋은 하루입니다"
+        docs = [
+            {"text": text},
+            {"text": "전혀 다른 내용의 문서로 경제 뉴스와 주식 시장 동향을 다룹니다"},
+            {"text": text},
+        ]
+        for cutoff in (2048, 0):
+            src, dst = candidate_edges(docs, {"dense_cluster_cutoff": cutoff})
+            pairs = {tuple(sorted(edge)) for edge in zip(src.tolist(), dst.tolist()) if edge[0] != edge[1]}
+            assert pairs == {(0, 2)}
+
+    def test_find_duplicate_clusters_merges_chained_buckets(self):
+        """Documents chained through different bands form one cluster"""
+        datasketch = pytest.importorskip("datasketch")
+        from dedup.minhash_utils import OPHMinHash
+
+        lsh = datasketch.MinHashLSH(num_perm=16, params=(2, 8))
+        rows = {
+            "a": [1] * 8 + [2] * 8,
+            "b": [1] * 8 + [3] * 8,
+            "c": [4] * 8 + [3] * 8,
+            "d": [5] * 8 + [6] * 8,
+        }
+        minhashes = {key: OPHMinHash(np.array(row, dtype=np.uint64)) for key, row in rows.items()}
+        for key, minhash in minhashes.items():
+            lsh.insert(key, minhash)
+
+        clusters, pairs = find_duplicate_clusters(lsh, minhashes)
+
+        assert clusters == [{"a", "b", "c"}]
+        assert sorted(pairs) == [("a", "b"), ("b", "c")]
+
+    def test_index_and_cluster_matches_two_pass_clusters(self):
+        """Single-pass labelling finds the same clusters as index + walk"""
+        fakeredis = pytest.importorskip("fakeredis")
+        text = "오늘은 날씨가 맑고 바람이 조금 불어서 산책하기 좋은 하루입니다"
+        docs = [
+            {"text": text},
+            {"text": "전혀 다른 내용의 문서로 경제 뉴스와 주식 시장 동향을 다룹니다"},
+            {"text": text},
+        ]
+        r = fakeredis.FakeRedis()
+        config = {
+            "redis": {"host": "localhost", "port": 6379, "prefix": "fused"},
+            "dense_cluster_cutoff": 0,
+            "lsh_backend": "redis",
+        }
+        with patch("redis.Redis", return_value=r), patch("redis.StrictRedis", return_value=r):
+            labels = index_and_cluster(docs, config)
+
+        assert labels.shape == (3,)
+        assert labels[0] == labels[2] != labels[1]
+        assert clusters_from_labels(labels) == [{"0", "2"}]
+
+        dense = index_and_cluster(docs, {"dense_cluster_cutoff": 10})
+        assert clusters_from_labels(dense) == [{"0", "2"}]
+
+        permuted = index_and_cluster(docs, {"signature_scheme": "permutation"})
+        assert clusters_from_labels(permuted) == [{"0", "2"}]
+
+        banded = index_and_cluster(docs, {"dense_cluster_cutoff": 0})
+        assert clusters_from_labels(banded) == [{"0", "2"}]
+
+    def test_connected_component_labels_without_scipy(self):
+        """The union-find fallback groups the same nodes as SciPy"""
+        from dedup import slimpajama_dedup
+
+        src = np.array([1, 3, 5], dtype=np.int32)
+        dst = np.array([0, 1, 4], dtype=np.int32)
+        with patch.object(slimpajama_dedup, "connected_components", None):
+            labels = slimpajama_dedup._connected_component_labels(7, src, dst)
+
+        assert sorted(map(sorted, clusters_from_labels(labels))) == [["0", "1", "3"], ["4", "5"]]
+
+    def test_iter_clean_batches_parallel_matches_serial(self):
+        """Worker-pool cleaning keeps order and matches the serial path"""
+        records = [{"text": f"문서  {i}\u3000본문"} if i % 3 else {"title": "no text"} for i in range(20)]
+
+        serial = list(iter_clean_batches(records, ["text"], workers=1, batch_size=4))
+        parallel = list(iter_clean_batches(records, ["text"], workers=2, batch_size=4))
+
+        assert parallel == serial
+        assert sum(invalid for _, invalid in serial) == 7
+        assert serial[0][0][0]["text"] == "문서 1 본문"
+
+    def test_iter_clean_batches_matches_validate_json(self):
+        """Batch cleaning accepts exactly the documents validate_json accepts"""
+        from utils.data_utils import validate_json
+
+        records = [
+            {"text": "본문", "source": "a"},
+            {"text": "본문"},
+            {"text": "", "source": "a"},
+            {"text": "본문", "source": None},
+            {"text": "본문", "source": []},
+            {"text": "본문", "source": 0},
+            ["not", "a", "dict"],
+        ]
+        for fields in (["text", "source"], ["text"], ["text", "text"], []):
+            expected = sum(not validate_json(doc, fields)[0] for doc in records)
+            (cleaned, invalid), = iter_clean_batches(records, fields, batch_size=len(records))
+            assert invalid == expected
+            assert len(cleaned) == len(records) - expected
+
+    def test_signature_workers_match_serial_signatures(self):
+        """Pooled signature batches keep document order and values"""
+        from dedup.slimpajama_dedup import _iter_signature_batches
+
+        docs = [{"text": f"문서 번호 {i} 의 본문은 충분히 길어야 합니다"} if i % 4 else {"text": "짧음"} for i in range(10)]
+        config = {"signature_batch_size": 3}
+
+        serial = list(_iter_signature_batches(docs, config))
+        parallel = list(_iter_signature_batches(docs, {**config, "signature_workers": 2}))
+
+        assert [ids for ids, _ in parallel] == [ids for ids, _ in serial]
+        assert [i for ids, _ in serial for i in ids] == [i for i in range(10) if i % 4]
+        assert all(np.array_equal(a, b) for (_, a), (_, b) in zip(serial, parallel))
+
+    def test_clean_signed_batches_match_signature_batches(self):
+        """Signatures computed in the cleaning pool match the separate pass"""
+        from dedup.slimpajama_dedup import _iter_signature_batches, iter_clean_signed_batches
+
+        records = [{"text": f"문서 번호 {i} 의 본문은 충분히 길어야 합니다"} if i % 4 else {"title": "x"} for i in range(12)]
+        config = {"signature_batch_size": 1024}
+
+        parallel = list(iter_clean_signed_batches(records, ["text"], config, workers=2, batch_size=5))
+        cleaned = [doc for batch, *_ in parallel for doc in batch]
+        (expected_ids, expected), = _iter_signature_batches(cleaned, config)
+
+        offsets = np.cumsum([0] + [len(batch) for batch, *_ in parallel[:-1]])
+        ids = [i + offset for (_, _, batch_ids, _), offset in zip(parallel, offsets) for i in batch_ids]
+        assert ids == expected_ids
+        assert np.array_equal(np.concatenate([sigs for *_, sigs in parallel]), expected)
+        assert sum(invalid for _, invalid, _, _ in parallel) == 3
+
+    def test_deduplicate_spooled_matches_in_memory(self, tmp_path):
+        """Spool-based dedup keeps the same documents as the in-memory path"""
+        docs = [
+            {"text": "짧은 문서", "id": 0},
+            {"text": "조금 더 긴 문서의 본문입니다", "id": 1},
+            {"text": "다른 문서", "id": 2},
+            {"text": "짧은 문서 하나", "id": 3},
+        ]
+        clusters = [{"0", "1", "3"}]
+        spool = tmp_path / "ready.jsonl"
+        lines = [json.dumps(doc, ensure_ascii=False).encode() + b"\n" for doc in docs]
+        spool.write_bytes(b"".join(lines))
+        offsets = np.cumsum([0] + [len(line) for line in lines[:-1]])
+
+        for strategy in ("min_index", "longest"):
+            expected, expected_stats = deduplicate_documents(docs, clusters, strategy)
+            stats = deduplicate_spooled(str(spool), offsets, clusters, str(tmp_path / "out.jsonl"), strategy)
+
+            kept = [json.loads(line) for line in (tmp_path / "out.jsonl").read_text(encoding="utf-8").splitlines()]
+            assert kept == expected
+            assert stats == expected_stats
+
+    def test_deduplicate_documents_representative_strategies(self):
+        """min_index keeps the lowest id; longest keeps the longest, ties to the lowest id"""
+        docs = [{"text": "bb"}, {"text": "a"}, {"text": "ccc"}, {"text": "dd"}, {"text": "ee"}]
+        clusters = [{"1", "2"}, {"4", "3", "0"}]
+
+        kept, stats = deduplicate_documents(docs, clusters)
+        assert kept == [docs[0], docs[1]]
+        assert stats["removed_count"] == 3
+
+        kept, _ = deduplicate_documents(docs, clusters, "longest")
+        assert kept == [docs[0], docs[2]]
+
+        with pytest.raises(ValueError):
+            deduplicate_documents(docs, clusters, "newest")
+
+    def test_drop_exact_duplicates_keeps_first_copy(self):
+        """Exact text copies are removed before MinHash, keeping the first"""
+        docs = [{"text": "a", "id": 0}, {"text": "b", "id": 1}, {"text": "a", "id": 2}]
+        unique, removed = drop_exact_duplicates(docs)
+
+        assert [doc["id"] for doc in unique] == [0, 1]
+        assert removed == 1
+
+    def test_drop_exact_duplicates_shares_seen_across_batches(self):
+        """A shared seen set drops copies across stream batches; records without text are kept"""
+        seen = set()
+        first, _ = drop_exact_duplicates([{"text": "a"}, ["not", "a", "dict"]], seen)
+        second, removed = drop_exact_duplicates([{"text": "a"}, {"title": "x"}, {"text": "b"}], seen)
+
+        assert first == [{"text": "a"}, ["not", "a", "dict"]]
+        assert second == [{"title": "x"}, {"text": "b"}]
+        assert removed == 1
+
+
 
 class TestClusterReduction:
     """Test cluster reduction functions"""
@@ -135,6 +590,28 @@ class TestClusterReduction:
         selected_idx = select_representative_document(docs, strategy="longest")
         assert selected_idx == 1  # More tokens
 
+    def test_select_highest_quality_document(self):
+        """Test selecting the document with the best quality score"""
+        docs = [
+            {"text": "spam spam spam", "source": "forum"},
+            {"text": "고품질 한국어 텍스트입니다. 적절한 길이를 가지고 있습니다.", "source": "wikipedia", "lang": "ko"},
+        ]
+
+        selected_idx = select_representative_document(docs, strategy="highest_quality")
+        assert selected_idx == 1
+
+    def test_select_newest_document(self):
+        """Test selecting the most recent document across timestamp formats"""
+        docs = [
+            {"text": "가장 긴 텍스트 샘플입니다", "timestamp": "2023-01-01 10:00:00"},
+            {"text": "짧은", "timestamp": "2024-03-01T09:30:00"},
+            {"text": "숫자", "timestamp": 1600000000},
+            {"text": "잘못된", "timestamp": "not a date"},
+        ]
+
+        selected_idx = select_representative_document(docs, strategy="newest")
+        assert selected_idx == 1
+
     def test_calculate_quality_score(self):
         """Test quality score calculation"""
         doc = {
@@ -197,5 +674,51 @@ class TestDeduplicationIntegration:
         # The longer similar document should be kept as representative
 
 
+def test_validate_cloud_jsonl_file_reads_only_sampled_lines():
+    """Validation stops streaming after the sampled lines"""
+    consumed = []
+
+    def stream_file_lines(path):
+        for i in range(1000):
+            consumed.append(i)
+            yield '{"text": "문서 %d"}' % i
+
+    storage_client = MagicMock()
+    storage_client.stream_file_lines.side_effect = stream_file_lines
+    is_valid, valid_lines, samples = validate_cloud_jsonl_file(storage_client, "in.jsonl", sample_size=10)
+
+    assert is_valid
+    assert valid_lines == 10
+    assert samples[0] == "문서 0"
+    assert len(consumed) <= 11
+    storage_client.read_text_file.assert_not_called()
+
+
+def test_package_import_defers_heavy_modules():
+    """Importing ``dedup`` must not load the pipeline or Ray driver modules"""
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, dedup; "
+        "assert 'dedup.slimpajama_dedup' not in sys.modules; "
+        "assert 'dedup.distributed_dedup' not in sys.modules; "
+        "assert callable(dedup.run_deduplication)"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_pipeline_import_does_not_load_pandas():
+    """pandas is only imported by ``main`` for the CSV log"""
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, dedup.slimpajama_dedup; "
+        "assert 'pandas' not in sys.modules"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
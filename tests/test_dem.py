@@ -131,3 +131,74 @@ def test_vector_diff_cli_creates_files(tmp_path) -> None:
 
     for key in ["norm", "max", "min"]:
         assert key in stats
+
+
+def test_merge_model_files_applies_safetensors_diffs(tmp_path) -> None:
+    """Safetensors diffs are applied per parameter with their weights."""
+    torch = pytest.importorskip("torch")
+    pytest.importorskip("safetensors")
+    from dem.merge_model import merge_model_files, save_state_dict
+
+    base_path = tmp_path / "base.pt"
+    torch.save({"w": torch.zeros(2, 2), "b": torch.ones(2)}, base_path)
+    diff1 = tmp_path / "diff1.safetensors"
+    diff2 = tmp_path / "diff2.safetensors"
+    save_state_dict(str(diff1), {"w": torch.ones(2, 2)})
+    save_state_dict(str(diff2), {"w": torch.ones(2, 2), "b": torch.ones(2)})
+
+    merged = merge_model_files(str(base_path), [(str(diff1), 0.5), (str(diff2), 2.0)])
+
+    assert list(merged) == ["w", "b"]
+    assert torch.equal(merged["w"], torch.full((2, 2), 2.5))
+    assert torch.equal(merged["b"], torch.full((2,), 3.0))
+
+
+def test_compute_stats_handles_integer_buffers() -> None:
+    """Integer entries are upcast instead of failing the reductions."""
+    torch = pytest.importorskip("torch")
+
+    diff = {"w": torch.tensor([0.5, -2.0]), "position_ids": torch.arange(4, dtype=torch.int64)}
+
+    stats = compute_stats(diff)
+
+    assert stats["max"] == 3.0
+    assert stats["min"] == -2.0
+    assert stats["norm"] == pytest.approx((0.25 + 4.0 + 0 + 1 + 4 + 9) ** 0.5)
+
+
+def test_merge_models_promotes_integer_buffers() -> None:
+    """Integer buffers are added out of place with dtype promotion."""
+    torch = pytest.importorskip("torch")
+
+    base = {"w": torch.zeros(2), "steps": torch.tensor(3)}
+    diff = {"w": torch.ones(2), "steps": torch.tensor(2)}
+
+    merged = merge_models(base, [(diff, 0.5)])
+
+    assert torch.equal(merged["w"], torch.full((2,), 0.5))
+    assert merged["steps"].item() == 4.0
+
+
+def test_merge_models_rejects_unknown_parameters() -> None:
+    """A diff with a parameter missing from the base is an error."""
+    torch = pytest.importorskip("torch")
+
+    with pytest.raises(KeyError):
+        merge_models({"w": torch.zeros(2)}, [({"v": torch.ones(2)}, 1.0)])
+
+
+def test_merge_model_files_promotes_safetensors_entries(tmp_path) -> None:
+    """Safetensors diffs merge into integer buffers and scalar entries."""
+    torch = pytest.importorskip("torch")
+    pytest.importorskip("safetensors")
+    from dem.merge_model import merge_model_files, save_state_dict
+
+    base_path = tmp_path / "base.pt"
+    torch.save({"steps": torch.tensor(3), "scale": torch.tensor(1.0)}, base_path)
+    diff = tmp_path / "diff.safetensors"
+    save_state_dict(str(diff), {"steps": torch.tensor(2), "scale": torch.ones(2)})
+
+    merged = merge_model_files(str(base_path), [(str(diff), 0.5)])
+
+    assert merged["steps"].item() == 4.0
+    assert torch.equal(merged["scale"], torch.full((2,), 1.5))
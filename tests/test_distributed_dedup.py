@@ -42,4 +42,61 @@ def test_run_distributed_cli(tmp_path):
     lines = out.read_text(encoding="utf-8").strip().split("\n")
     assert len(lines) <= 2
     assert log_csv.exists()
-    assert cand.exists()
+    assert isinstance(json.loads(cand.read_text(encoding="utf-8")), list)
+
+
+def test_run_dedup_ray_preserves_input_order(tmp_path):
+    from dedup.distributed_dedup import run_dedup_ray
+
+    texts = [f"doc{i}" for i in range(12)]
+    data = tmp_path / "data.jsonl"
+    data.write_text(
+        "".join(json.dumps({"text": t}) + "\n" for t in texts), encoding="utf-8"
+    )
+    out = tmp_path / "out.jsonl"
+    conf = tmp_path / "conf.yaml"
+    conf.write_text("redis:\n  host: localhost\n  port: 6379\n", encoding="utf-8")
+
+    run_dedup_ray(
+        str(data),
+        str(out),
+        str(tmp_path / "log.csv"),
+        str(tmp_path / "cand.json"),
+        str(conf),
+        num_workers=2,
+        chunk_size=2,
+        local=False,
+    )
+
+    lines = out.read_text(encoding="utf-8").strip().split("\n")
+    assert [json.loads(line)["text"] for line in lines] == texts
+    assert json.loads((tmp_path / "cand.json").read_text(encoding="utf-8")) == []
+
+
+def test_run_dedup_ray_streams_candidate_clusters(tmp_path):
+    from unittest.mock import patch
+
+    from dedup.distributed_dedup import run_dedup_ray
+
+    fakeredis = pytest.importorskip("fakeredis")
+    r = fakeredis.FakeRedis()
+    text = "오늘은 날씨가 맑고 바람이 조금 불어서 산책하기 좋은 하루입니다 " * 4
+    near = text + "정말로"
+    data = tmp_path / "data.jsonl"
+    data.write_text(
+        json.dumps({"text": text}) + "\n" + json.dumps({"text": near}) + "\n",
+        encoding="utf-8",
+    )
+    out = tmp_path / "out.jsonl"
+    cand = tmp_path / "cand.json"
+    conf = tmp_path / "conf.yaml"
+    conf.write_text("redis:\n  host: localhost\n  port: 6379\n  prefix: ray\n", encoding="utf-8")
+
+    with patch("redis.Redis", return_value=r), patch("redis.StrictRedis", return_value=r):
+        run_dedup_ray(
+            str(data), str(out), str(tmp_path / "log.csv"), str(cand), str(conf),
+            num_workers=1, chunk_size=2, local=True,
+        )
+
+    assert len(out.read_text(encoding="utf-8").strip().split("\n")) == 1
+    assert [sorted(c) for c in json.loads(cand.read_text(encoding="utf-8"))] == [["0", "1"]]
@@ -132,3 +132,21 @@ def test_compute_metrics_cli(tmp_path) -> None:
     assert out_csv.exists()
     text = out_csv.read_text(encoding="utf-8")
     assert "bleu" in text
+
+
+def test_rouge_scores_match_rouge_scorer() -> None:
+    """The single-pass ROUGE scores equal rouge_score's RougeScorer."""
+    from rouge_score import rouge_scorer
+    from evaluation.compute_metrics import _score_one
+
+    scorer = rouge_scorer.RougeScorer(["rouge1", "rouge2", "rougeL"], use_stemmer=True)
+    pairs = [
+        ("the cat sat on the mat", "the cat is on the mat"),
+        ("running dogs run fast", "a dog runs quickly"),
+        ("hello world", ""),
+        ("a b a b a", "b a b"),
+    ]
+    for ref, pred in pairs:
+        scores = scorer.score(ref, pred)
+        expected = tuple(scores[name].fmeasure for name in ("rouge1", "rouge2", "rougeL"))
+        assert _score_one((ref, pred)) == pytest.approx(expected)
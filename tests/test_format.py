@@ -35,3 +35,86 @@ def test_convert_jsonl_to_parquet(tmp_path) -> None:
     expected = create_schema(config["schema"])
     lines = [l.strip() for l in schema_path.read_text().splitlines() if l.strip()]
     assert lines == [f"{f.name}:{f.type}" for f in expected]
+
+
+def test_convert_jsonl_to_parquet_cleans_rows(tmp_path) -> None:
+    """Rows with missing or null fields and blank texts are dropped and unknown fields ignored."""
+    sample = tmp_path / "sample.jsonl"
+    sample.write_text(
+        '{"text":"a","tokens":["x"],"extra":1}\n'
+        '{"text":"  ","tokens":null}\n'
+        '{"text":"b"}\n'
+        '{"tokens":["y"]}\n',
+        encoding="utf-8",
+    )
+    out = tmp_path / "out.parquet"
+    config = {
+        "schema": {
+            "required_columns": ["text", "tokens"],
+            "column_types": {"text": "string", "tokens": "list[string]"},
+        }
+    }
+
+    convert_jsonl_to_parquet(str(sample), str(out), config)
+
+    assert pq.read_table(out).to_pylist() == [{"text": "a", "tokens": ["x"]}]
+
+
+def test_convert_jsonl_to_parquet_column_compression(tmp_path) -> None:
+    """Per-column codecs reach nested leaf columns; others keep the default."""
+    sample = tmp_path / "sample.jsonl"
+    sample.write_text('{"text":"a","tokens":["x"]}\n', encoding="utf-8")
+    out = tmp_path / "out.parquet"
+    config = {
+        "schema": {
+            "required_columns": ["text", "tokens"],
+            "column_types": {"text": "string", "tokens": "list[string]"},
+        },
+        "parquet": {"column_compression": {"tokens": "zstd"}, "compression_level": {"tokens": 9}},
+    }
+
+    convert_jsonl_to_parquet(str(sample), str(out), config)
+
+    row_group = pq.ParquetFile(out).metadata.row_group(0)
+    codecs = {row_group.column(i).path_in_schema: row_group.column(i).compression for i in range(2)}
+    assert codecs == {"text": "BROTLI", "tokens.list.element": "ZSTD"}
+
+
+def test_convert_jsonl_to_parquet_skips_malformed_lines(tmp_path) -> None:
+    """A malformed line is skipped instead of aborting the conversion."""
+    sample = tmp_path / "sample.jsonl"
+    sample.write_text('{"text":"a"}\n{"text": broken\n[1, 2]\n{"text":"b"}\n', encoding="utf-8")
+    out = tmp_path / "out.parquet"
+    config = {"schema": {"required_columns": ["text"], "column_types": {"text": "string"}}}
+
+    convert_jsonl_to_parquet(str(sample), str(out), config)
+
+    assert pq.read_table(out).to_pylist() == [{"text": "a"}, {"text": "b"}]
+
+
+def test_convert_jsonl_to_parquet_coerces_mixed_types(tmp_path) -> None:
+    """Mistyped values are coerced and rows missing a field are dropped."""
+    sample = tmp_path / "sample.jsonl"
+    sample.write_text(
+        '{"text":"a","tokens":["x"]}\n'
+        '{"text":5,"tokens":["y", 1]}\n'
+        '{"text":"c","tokens":"z"}\n'
+        '{"text":"d","tokens":null}\n'
+        '{"tokens":["w"]}\n',
+        encoding="utf-8",
+    )
+    out = tmp_path / "out.parquet"
+    config = {
+        "schema": {
+            "required_columns": ["text", "tokens"],
+            "column_types": {"text": "string", "tokens": "list[string]"},
+        }
+    }
+
+    convert_jsonl_to_parquet(str(sample), str(out), config)
+
+    assert pq.read_table(out).to_pylist() == [
+        {"text": "a", "tokens": ["x"]},
+        {"text": "5", "tokens": ["y", "1"]},
+        {"text": "c", "tokens": ["z"]},
+    ]
@@ -15,3 +15,40 @@ def test_run_mapreduce(tmp_path):
     run_dedup_mapreduce(str(data), str(out), str(conf), workers=1, chunk_size=1)
     lines = out.read_text(encoding="utf-8").strip().split('\n')
     assert len(lines) <= 2
+
+
+def test_run_mapreduce_after_signatures_in_parent(tmp_path):
+    """Forking the worker pool after computing signatures must not hang."""
+    from dedup.minhash_utils import create_minhash_oph_batch
+
+    create_minhash_oph_batch([["a b", "b c"], ["c d"]], num_perm=16)
+
+    data = tmp_path / "data.jsonl"
+    data.write_text('{"text":"a"}\n{"text":"b"}\n{"text":"a"}\n', encoding="utf-8")
+    out = tmp_path / "out.jsonl"
+    conf = tmp_path / "conf.yaml"
+    conf.write_text("redis:\n  host: localhost\n  port: 6379\n", encoding="utf-8")
+    run_dedup_mapreduce(str(data), str(out), str(conf), workers=2, chunk_size=1)
+    assert out.exists()
+
+
+def test_run_mapreduce_streams_in_input_order(tmp_path):
+    texts = [f"t{i}" for i in range(8)]
+    data = tmp_path / "data.jsonl"
+    data.write_text("".join(json.dumps({"text": t}) + "\n" for t in texts), encoding="utf-8")
+    out = tmp_path / "out.jsonl"
+    conf = tmp_path / "conf.yaml"
+    conf.write_text("redis:\n  host: localhost\n  port: 6379\n", encoding="utf-8")
+    run_dedup_mapreduce(str(data), str(out), str(conf), workers=2, chunk_size=3)
+    lines = out.read_text(encoding="utf-8").strip().split('\n')
+    assert [json.loads(line)["text"] for line in lines] == texts
+
+
+def test_run_mapreduce_writes_unescaped_utf8(tmp_path):
+    data = tmp_path / "data.jsonl"
+    data.write_text(json.dumps({"text": "한국어"}) + "\n", encoding="utf-8")
+    out = tmp_path / "out.jsonl"
+    conf = tmp_path / "conf.yaml"
+    conf.write_text("redis:\n  host: localhost\n  port: 6379\n", encoding="utf-8")
+    run_dedup_mapreduce(str(data), str(out), str(conf), workers=1, chunk_size=1)
+    assert "한국어" in out.read_text(encoding="utf-8")
@@ -22,6 +22,8 @@ from pathlib import Path
 import tempfile
 import json
 
+from .data_utils import loads_json
+
 try:
     import boto3
     from botocore.exceptions import ClientError, NoCredentialsError
@@ -410,7 +412,7 @@ class CloudStorageManager:
             if not line:
                 continue
             try:
-                yield json.loads(line)
+                yield loads_json(line)
             except json.JSONDecodeError as e:
                 self.logger.warning(
                     f"Invalid JSON at line {i+1} in {cloud_path}: {e}"
@@ -435,7 +437,7 @@ class CloudStorageManager:
             if not line:
                 continue
             try:
-                yield json.loads(line)
+                yield loads_json(line)
             except json.JSONDecodeError:
                 self.logger.warning("Invalid JSON line skipped")
 
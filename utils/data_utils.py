@@ -17,9 +17,61 @@ Generate a manifest::
 
 import json
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
 import re
+import unicodedata
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    """Parse a JSON document, using ``orjson`` when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_json(obj: Any) -> bytes:
+    """Serialize ``obj`` to UTF-8 JSON bytes, using ``orjson`` when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+def iter_jsonl_chunks(
+    file_path: str,
+    chunk_size: int,
+    buffering: int = 1 << 20,
+) -> Iterator[List[bytes]]:
+    """
+    Stream a JSONL file as lists of raw lines
+
+    Only one chunk is held in memory at a time, so arbitrarily large inputs
+    can be fed to workers without loading the whole file.
+
+    Args:
+        file_path: Path to the JSONL file
+        chunk_size: Number of non-empty lines per chunk
+        buffering: Read buffer size in bytes
+
+    Yields:
+        Lists of at most ``chunk_size`` raw lines (``bytes``)
+    """
+    chunk: List[bytes] = []
+    with open(file_path, 'rb', buffering=buffering) as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            chunk.append(line)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
 
 
 def validate_jsonl_format(file_content: str, max_lines_check: int = 100) -> Tuple[bool, Dict[str, Any]]:
@@ -59,7 +111,7 @@ def validate_jsonl_format(file_content: str, max_lines_check: int = 100) -> Tupl
             continue
 
         try:
-            doc = json.loads(line)
+            doc = loads_json(line)
             validation_info['valid_lines'] += 1
 
             # Collect schema fields
@@ -156,6 +208,24 @@ def validate_document_schema(doc: Dict, required_fields: List[str]) -> Tuple[boo
     return len(missing_fields) == 0, missing_fields
 
 
+_nfkc = unicodedata.normalize
+
+
+def normalize_text(text: str) -> str:
+    """
+    Apply NFKC normalization and collapse whitespace runs to single spaces
+
+    Args:
+        text: Input text
+
+    Returns:
+        Normalized text without leading or trailing whitespace
+    """
+    # split/join is faster here than a compiled ``\s+`` substitution and
+    # already leaves no surrounding whitespace
+    return ' '.join(_nfkc('NFKC', text).split())
+
+
 def normalize_document(doc: Dict) -> Dict:
     """
     Normalize document fields
@@ -166,18 +236,11 @@ def normalize_document(doc: Dict) -> Dict:
     Returns:
         Normalized document
     """
-    import unicodedata
-
     normalized = {}
 
     # Normalize text content
     if 'text' in doc and doc['text']:
-        text = str(doc['text'])
-        # Unicode normalization
-        text = unicodedata.normalize('NFKC', text)
-        # Remove excessive whitespace
-        text = ' '.join(text.split())
-        normalized['text'] = text
+        normalized['text'] = normalize_text(str(doc['text']))
 
     # Copy other fields
     for key, value in doc.items():